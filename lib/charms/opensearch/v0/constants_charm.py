@@ -24,6 +24,7 @@ ExclusionFailed = "The {} exclusion(s) of this node failed."
 AllocationExclusionFailed = "The exclusion of this node from the allocations failed."
 VotingExclusionFailed = "The exclusion of this node from the voting list failed."
 ServiceStartError = "An error occurred during the start of the OpenSearch service."
+SecurityIndexInitError = "The initialization of the security index failed, check the logs."
 ServiceStopped = "The OpenSearch service stopped."
 ServiceStopFailed = "An error occurred while attempting to stop the OpenSearch service."
 ServiceIsStopping = "The OpenSearch service is stopping."
@@ -25,6 +25,12 @@ class DeferTriggerEvent(EventBase):
     pass
 
 
+class RecomputeRolesEvent(EventBase):
+    """Event triggered to have the leader recompute the roles of the nodes."""
+
+    pass
+
+
 class Status:
     """Class for managing the various status changes in a charm."""
 
@@ -3,11 +3,13 @@
 
 """Utility classes and methods for getting cluster info, configuration info and suggestions."""
 import logging
+from collections import Counter
+from itertools import chain
 from random import choice
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Optional, Tuple
 
 from charms.opensearch.v0.helper_enums import BaseStrEnum
-from charms.opensearch.v0.models import Node
+from charms.opensearch.v0.models import ROLE_BITS, Node
 from charms.opensearch.v0.opensearch_distro import OpenSearchDistribution
 from tenacity import retry, stop_after_attempt, wait_exponential
 
@@ -25,6 +27,11 @@ LIBPATCH = 1
 logger = logging.getLogger(__name__)
 
 
+# default roles of the auto-generated nodes, on top of which "cluster_manager" may be set
+BASE_ROLES = ("data", "ingest", "ml", "coordinating_only")
+CM_ROLES = BASE_ROLES + ("cluster_manager",)
+
+
 class IndexStateEnum(BaseStrEnum):
     """Enum for index states."""
 
@@ -47,15 +54,11 @@ class ClusterTopology:
             — odd: "all" the nodes are cm_eligible nodes.
             — even: "all - 1" are cm_eligible and 1 data node.
         """
-        max_cms = ClusterTopology.max_cluster_manager_nodes(planned_units)
-
-        base_roles = ["data", "ingest", "ml", "coordinating_only"]
+        current_cms = sum(1 for node in nodes if node.is_cm_eligible())
+        if current_cms == ClusterTopology.max_cluster_manager_nodes(planned_units):
+            return list(BASE_ROLES)
 
-        nodes_by_roles = ClusterTopology.nodes_count_by_role(nodes)
-        if nodes_by_roles.get("cluster_manager", 0) == max_cms:
-            return base_roles
-
-        return base_roles + ["cluster_manager"]
+        return list(CM_ROLES)
 
     @staticmethod
     def recompute_nodes_conf(app_name: str, nodes: List[Node]) -> Dict[str, Node]:
@@ -82,9 +85,6 @@ class ClusterTopology:
         This method works hand in hand with node_with_new_roles which assumes a clean
         base (regarding the auto-generation logic) and only applies changes to 1 node.
         """
-        base_roles = ["data", "ingest", "ml", "coordinating_only"]
-        full_roles = base_roles + ["cluster_manager"]
-
         current_cluster_nodes = [node for node in nodes if node.app_name == app_name]
         current_cm_eligible = [node for node in current_cluster_nodes if node.is_cm_eligible()]
 
@@ -95,10 +95,10 @@ class ClusterTopology:
         updated_nodes = []
         for node in current_cluster_nodes:
             # we do this in order to remove any non-default role / add any missing default role
-            new_roles = full_roles if unbalanced or node.is_cm_eligible() else base_roles
+            new_roles = CM_ROLES if unbalanced or node.is_cm_eligible() else BASE_ROLES
             updated = Node(
                 name=node.name,
-                roles=new_roles,
+                roles=list(new_roles),
                 ip=node.ip,
                 app_name=node.app_name,
                 temperature=node.temperature,
@@ -120,8 +120,7 @@ class ClusterTopology:
         max_cms = ClusterTopology.max_cluster_manager_nodes(len(remaining_nodes))
 
         nodes_by_roles = ClusterTopology.nodes_by_role(remaining_nodes)
-        nodes_count_by_roles = ClusterTopology.nodes_count_by_role(remaining_nodes)
-        current_cms = nodes_count_by_roles.get("cluster_manager", 0)
+        current_cms = len(nodes_by_roles.get("cluster_manager", []))
 
         # the nodes involved in the voting are intact, do nothing
         if current_cms == max_cms:
@@ -142,9 +141,7 @@ class ClusterTopology:
             )
 
         # when cm count smaller than expected
-        data_only_nodes = [
-            node for node in nodes_by_roles["data"] if "cluster_manager" not in node.roles
-        ]
+        data_only_nodes = [node for node in nodes_by_roles["data"] if not node.is_cm_eligible()]
 
         # no data-only node available to change, leave
         if not data_only_nodes:
@@ -171,36 +168,47 @@ class ClusterTopology:
         return max_managers
 
     @staticmethod
-    def get_cluster_managers_ips(nodes: List[Node]) -> List[str]:
+    def get_cluster_managers_ips(nodes: Iterable[Node]) -> List[str]:
         """Get the nodes of cluster manager eligible nodes."""
-        result = []
-        for node in nodes:
-            if node.is_cm_eligible():
-                result.append(node.ip)
-
-        return result
+        return [node.ip for node in nodes if node.is_cm_eligible()]
 
     @staticmethod
     def get_cluster_managers_names(nodes: List[Node]) -> List[str]:
         """Get the nodes of cluster manager eligible nodes."""
-        result = []
+        return [node.name for node in nodes if node.is_cm_eligible()]
+
+    @staticmethod
+    def get_cluster_managers(nodes: List[Node]) -> Tuple[List[str], List[str]]:
+        """Get the names and ips of cluster manager eligible nodes, in a single pass."""
+        names, ips = [], []
         for node in nodes:
             if node.is_cm_eligible():
-                result.append(node.name)
+                names.append(node.name)
+                ips.append(node.ip)
 
-        return result
+        return names, ips
 
     @staticmethod
     def nodes_count_by_role(nodes: List[Node]) -> Dict[str, int]:
         """Count number of nodes by role."""
-        result = {}
-        for node in nodes:
-            for role in node.roles:
-                if role not in result:
-                    result[role] = 0
-                result[role] += 1
+        return Counter(chain.from_iterable(node.roles for node in nodes))
 
-        return result
+    @staticmethod
+    def nodes_bitmap_by_role(nodes: List[Node]) -> Dict[str, int]:
+        """Get, for each known role, a bitmap where the bit i is set if nodes[i] has the role.
+
+        Bitmaps of several roles can be OR'd together before counting, which counts
+        each node once even when it holds several of the roles, i.e:
+            (bitmaps["cluster_manager"] | bitmaps["voting_only"]).bit_count()
+        """
+        bitmaps = dict.fromkeys(ROLE_BITS, 0)
+        for index, node in enumerate(nodes):
+            role_mask = node.role_mask
+            for role, bit in ROLE_BITS.items():
+                if role_mask & bit:
+                    bitmaps[role] |= 1 << index
+
+        return bitmaps
 
     @staticmethod
     def nodes_by_role(nodes: List[Node]) -> Dict[str, List[Node]]:
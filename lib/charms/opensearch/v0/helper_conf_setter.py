@@ -3,15 +3,17 @@
 
 """Utilities for editing yaml config files at any depth level and maintaining comments."""
 import logging
+import os
 import re
 import sys
 import uuid
 from abc import ABC, abstractmethod
 from collections.abc import Mapping
+from copy import deepcopy
 from enum import Enum
 from io import StringIO
 from os.path import exists
-from typing import Dict, List
+from typing import Dict, List, Tuple
 
 from overrides import override
 from ruamel.yaml import YAML, CommentedSeq
@@ -121,6 +123,30 @@ class ConfigSetter(ABC):
         """
         pass
 
+    @abstractmethod
+    def delete_many(
+        self,
+        config_file: str,
+        key_paths: List[str],
+        sep="/",
+        output_type: OutputType = OutputType.file,
+        output_file: str = None,
+    ) -> Dict[str, any]:
+        """Delete the values of multiple keys, with a single read and write of the file.
+
+        Args:
+            config_file (str): Path to the source config file
+            key_paths (List[str]): The paths of the YAML keys to target
+            sep (str): The separator / delimiter character to use in the key_paths
+            output_type (OutputType): The type of output we're expecting from this operation,
+                i.e, set OutputType.all to have the output on both the console and target file
+            output_file: Target file for the result config, by default same as config_file
+
+        Returns:
+            Dict[str, any]: The final version of the YAML config.
+        """
+        pass
+
     @abstractmethod
     def replace(
         self,
@@ -166,14 +192,26 @@ class YamlConfigSetter(ConfigSetter):
         super().__init__(base_path)
         self.yaml = YAML()
 
+        # parsed content of the files, by path, along with the stat of the file when parsed
+        self._cache: Dict[str, Tuple[Tuple[int, int, int], Dict[str, any]]] = {}
+
     @override
     def load(self, config_file: str) -> Dict[str, any]:
-        """Load the content of a YAML file."""
+        """Load the content of a YAML file.
+
+        The file is only parsed again if it changed on disk since the last load / write.
+        """
         path = f"{self.base_path}{config_file}"
 
         if not exists(path):
             raise FileNotFoundError(f"{path} not found.")
 
+        file_stat = self.__stat(path)
+        cached = self._cache.get(path)
+        if cached and cached[0] == file_stat:
+            # callers are free to mutate the returned data
+            return deepcopy(cached[1])
+
         with open(path, "r") as f:
             lines = f.read().splitlines()
 
@@ -183,7 +221,8 @@ class YamlConfigSetter(ConfigSetter):
             data = self.yaml.load(StringIO("\n".join(lines)))
             del data[random_id]
 
-            return data
+        self._cache[path] = (file_stat, deepcopy(data))
+        return data
 
     @override
     def put(
@@ -222,9 +261,22 @@ class YamlConfigSetter(ConfigSetter):
         output_file: str = None,
     ) -> Dict[str, any]:
         """Delete the value of a key (or content of array at index / key) if it exists."""
+        return self.delete_many(config_file, [key_path], sep, output_type, output_file)
+
+    @override
+    def delete_many(
+        self,
+        config_file: str,
+        key_paths: List[str],
+        sep="/",
+        output_type: OutputType = OutputType.file,
+        output_file: str = None,
+    ) -> Dict[str, any]:
+        """Delete the values of multiple keys, with a single read and write of the file."""
         data = self.load(config_file)
 
-        self.__deep_delete(data, key_path.split(sep))
+        for key_path in key_paths:
+            self.__deep_delete(data, key_path.split(sep))
 
         self.__dump(
             data,
@@ -262,6 +314,10 @@ class YamlConfigSetter(ConfigSetter):
         if not exists(path):
             raise FileNotFoundError(f"{path} not found.")
 
+        self._cache.pop(path, None)
+        if output_file is not None:
+            self._cache.pop(output_file, None)
+
         with open(path, "r+") as f:
             data = f.read()
 
@@ -295,6 +351,15 @@ class YamlConfigSetter(ConfigSetter):
             with open(target_file, mode="w") as f:
                 self.yaml.dump(data, f)
 
+            # write-through, the next load of the file is served without parsing it
+            self._cache[target_file] = (self.__stat(target_file), deepcopy(data))
+
+    @staticmethod
+    def __stat(path: str) -> Tuple[int, int, int]:
+        """Identify the version of a file on disk through its inode, size and mtime."""
+        file_stat = os.stat(path)
+        return file_stat.st_ino, file_stat.st_size, file_stat.st_mtime_ns
+
     def __deep_update(self, source, node_keys: List[str], val: any):
         """Recursively traverses the tree of nodes, and writes the value accordingly.
 
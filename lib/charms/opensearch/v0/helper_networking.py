@@ -6,6 +6,7 @@ import logging
 import os
 import socket
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional
 
 from ops.charm import CharmBase
@@ -24,6 +25,9 @@ LIBPATCH = 1
 
 logger = logging.getLogger(__name__)
 
+# upper bound of the hosts probed at once by reachable_hosts
+MAX_REACHABILITY_PROBES = 8
+
 
 def get_host_ip(charm: CharmBase, peer_relation_name: str) -> str:
     """Fetches the IP address of the current unit."""
@@ -97,10 +101,18 @@ def is_reachable(host: str, port: int) -> bool:
 
 
 def reachable_hosts(hosts: List[str]) -> List[str]:
-    """Returns a list of reachable hosts."""
-    reachable: List[str] = []
-    for host_candidate in hosts:
-        if is_reachable(host_candidate, 9200):
-            reachable.append(host_candidate)
+    """Returns a list of reachable hosts, in the order they were passed.
+
+    The hosts are probed concurrently, so that unreachable hosts cost a single
+    connection timeout overall rather than one each.
+    """
+    if not hosts:
+        return []
+
+    if len(hosts) == 1:
+        return [host for host in hosts if is_reachable(host, 9200)]
+
+    with ThreadPoolExecutor(max_workers=min(len(hosts), MAX_REACHABILITY_PROBES)) as executor:
+        reachable = list(executor.map(lambda host: is_reachable(host, 9200), hosts))
 
-    return reachable
+    return [host for host, is_host_reachable in zip(hosts, reachable) if is_host_reachable]
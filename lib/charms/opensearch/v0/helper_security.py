@@ -2,17 +2,18 @@
 # See LICENSE file for licensing details.
 
 """Helpers for security related operations, such as password generation etc."""
-import math
+import functools
 import os
 import secrets
 import string
 import subprocess
-import tempfile
-from datetime import datetime
+import time
+from datetime import timezone
 from typing import Optional, Tuple
 
 import bcrypt
 from cryptography import x509
+from cryptography.hazmat.primitives import serialization
 
 # The unique Charmhub library identifier, never change it
 LIBID = "224ce9884b0d47b997357fec522f11c7"
@@ -25,10 +26,26 @@ LIBAPI = 0
 LIBPATCH = 1
 
 
-def hash_string(string: str) -> str:
+# bcrypt cost factor, each increment doubles the hashing time
+BCRYPT_ROUNDS = 12
+
+PASSWORD_ALPHABET = (string.ascii_letters + string.digits).encode()
+PASSWORD_LENGTH = 32
+_PASSWORD_ALPHABET_SIZE = len(PASSWORD_ALPHABET)
+# largest multiple of the alphabet size fitting in a byte, random bytes above it are
+# rejected so that mapping them with a modulo does not bias the distribution
+_PASSWORD_BYTE_THRESHOLD = 256 - 256 % _PASSWORD_ALPHABET_SIZE
+
+
+def hash_string(string: str, rounds: int = BCRYPT_ROUNDS) -> str:
     """Hashes the given string."""
-    salt = bcrypt.gensalt()
-    hashed = bcrypt.hashpw(string.encode("utf-8"), salt)
+    return _hash(string.encode("utf-8"), rounds)
+
+
+def _hash(value: bytes, rounds: int) -> str:
+    """Hashes the given value with a freshly generated salt."""
+    salt = bcrypt.gensalt(rounds=rounds)
+    hashed = bcrypt.hashpw(value, salt)
     return hashed.decode("utf-8")
 
 
@@ -38,26 +55,55 @@ def generate_password() -> str:
     Returns:
        A random password string.
     """
-    choices = string.ascii_letters + string.digits
-    return "".join([secrets.choice(choices) for _ in range(32)])
+    return _generate_password_bytes().decode("ascii")
+
+
+def _generate_password_bytes() -> bytes:
+    """Generate a random ASCII encoded password."""
+    password = bytearray()
+    while len(password) < PASSWORD_LENGTH:
+        for byte in secrets.token_bytes(PASSWORD_LENGTH + PASSWORD_LENGTH // 2):
+            if byte >= _PASSWORD_BYTE_THRESHOLD:
+                continue
 
+            password.append(PASSWORD_ALPHABET[byte % _PASSWORD_ALPHABET_SIZE])
+            if len(password) == PASSWORD_LENGTH:
+                break
 
-def generate_hashed_password(pwd: Optional[str] = None) -> Tuple[str, str]:
+    return bytes(password)
+
+
+def generate_hashed_password(
+    pwd: Optional[str] = None, rounds: int = BCRYPT_ROUNDS
+) -> Tuple[str, str]:
     """Generates a password and its bcrypt hash.
 
+    Args:
+        pwd: the password to hash, a random one is generated if not set
+        rounds: the bcrypt cost factor (log2 of the number of iterations)
+
     Returns:
         A hash and the original password
     """
-    pwd = pwd or generate_password()
-    return hash_string(pwd), pwd
+    if pwd:
+        return hash_string(pwd, rounds), pwd
+
+    # the generated password is ASCII, hash its bytes rather than re-encoding it
+    pwd_bytes = _generate_password_bytes()
+    return _hash(pwd_bytes, rounds), pwd_bytes.decode("ascii")
+
+
+@functools.lru_cache(maxsize=256)
+def _cert_expiration_timestamp(cert: bytes) -> int:
+    """Parses a PEM certificate once and returns its expiration as a POSIX timestamp."""
+    not_valid_after = x509.load_pem_x509_certificate(data=cert).not_valid_after
+    # not_valid_after is a naive datetime in UTC, it must not be read as local time
+    return int(not_valid_after.replace(tzinfo=timezone.utc).timestamp())
 
 
 def cert_expiration_remaining_hours(cert: string) -> int:
     """Returns the remaining hours for the cert to expire."""
-    certificate_object = x509.load_pem_x509_certificate(data=cert.encode())
-    time_difference = certificate_object.not_valid_after - datetime.utcnow()
-
-    return math.floor(time_difference.total_seconds() / 3600)
+    return int((_cert_expiration_timestamp(cert.encode()) - time.time()) // 3600)
 
 
 def normalized_tls_subject(subject: string) -> str:
@@ -79,41 +125,40 @@ def rfc2253_tls_subject(subject: string) -> str:
 
 def to_pkcs8(private_key: str, password: Optional[str] = None) -> str:
     """Convert a PEM key to PKCS8."""
-    command = """openssl pkcs8 \
-        -inform PEM \
-        -outform PEM \
-        -in {tmp_key_filename} \
-        -topk8 \
-        -v1 PBE-SHA1-3DES \
-        -passout pass:"{password}" \
-        -passin pass:"{password}" \
-        -out {tmp_pkcs8_key_filename}"""
     if password is None:
-        password = ""
-        command = f"{command} -nocrypt"
-
-    tmp_key = tempfile.NamedTemporaryFile(delete=False)
-    tmp_pkcs8_key = tempfile.NamedTemporaryFile(delete=False)
-
-    try:
-        with open(tmp_key.name, "w") as f:
-            f.write(private_key)
-
-        subprocess.run(
-            command.format(
-                password=password,
-                tmp_key_filename=tmp_key.name,
-                tmp_pkcs8_key_filename=tmp_pkcs8_key.name,
-            ),
-            shell=True,
-            text=True,
-            check=True,
-            encoding="utf-8",
-            env=os.environ,
-        )
-
-        with open(tmp_pkcs8_key.name, "r") as f:
-            return f.read()
-    finally:
-        os.unlink(tmp_key.name)
-        os.unlink(tmp_pkcs8_key.name)
+        # unencrypted keys are serialized in-process, no need to shell out to openssl
+        key = serialization.load_pem_private_key(private_key.encode(), password=None)
+        return key.private_bytes(
+            encoding=serialization.Encoding.PEM,
+            format=serialization.PrivateFormat.PKCS8,
+            encryption_algorithm=serialization.NoEncryption(),
+        ).decode()
+
+    # encrypted keys must use PBE-SHA1-3DES, which is the scheme supported by the OpenSearch
+    # pem key reader, and which the cryptography lib cannot produce for PKCS8 keys.
+    # the key is piped through stdin / stdout and the password passed through the env,
+    # so that neither ends up on disk nor in the process list.
+    result = subprocess.run(
+        [
+            "openssl",
+            "pkcs8",
+            "-inform",
+            "PEM",
+            "-outform",
+            "PEM",
+            "-topk8",
+            "-v1",
+            "PBE-SHA1-3DES",
+            "-passout",
+            "env:PKCS8_PASSWORD",
+            "-passin",
+            "env:PKCS8_PASSWORD",
+        ],
+        input=private_key,
+        capture_output=True,
+        text=True,
+        check=True,
+        encoding="utf-8",
+        env={**os.environ, "PKCS8_PASSWORD": password},
+    )
+    return result.stdout
@@ -2,8 +2,9 @@
 # See LICENSE file for licensing details.
 
 """Cluster-related data structures / model classes."""
+import sys
 from abc import ABC
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, FrozenSet, List, Optional
 
 from charms.opensearch.v0.helper_enums import BaseStrEnum
 from pydantic import BaseModel, Field, root_validator, validator
@@ -19,6 +20,17 @@ LIBAPI = 0
 LIBPATCH = 1
 
 
+# bit assigned to each of the well known roles, used to build the role mask of a node
+ROLE_BITS = {
+    "cluster_manager": 1,
+    "voting_only": 2,
+    "data": 4,
+    "ingest": 8,
+    "ml": 16,
+    "coordinating_only": 32,
+}
+
+
 class Model(ABC, BaseModel):
     """Base model class."""
 
@@ -65,11 +77,43 @@ class Node(Model):
     app_name: str
     temperature: Optional[str] = None
 
-    @classmethod
+    def __eq__(self, other) -> bool:
+        """Implement equality, regardless of the order of the roles."""
+        if not isinstance(other, Node):
+            return super().__eq__(other)
+
+        return (
+            self.dict(exclude={"roles"}) == other.dict(exclude={"roles"})
+            and self.role_set == other.role_set
+        )
+
     @validator("roles")
-    def roles_set(cls, v):
-        """Returns deduplicated list of roles."""
-        return list(set(v))
+    def roles_set(cls, v):  # noqa: N805
+        """Returns deduplicated list of interned roles, preserving their order.
+
+        Roles deserialized from the relation data are new str objects, interning them
+        lets `"role" in node.roles` match the (interned) literals on identity.
+        """
+        return list(dict.fromkeys(sys.intern(role) for role in v))
+
+    @staticmethod
+    def compute_role_mask(roles: List[str]) -> int:
+        """Returns the bitmask of the well known roles out of a list of roles."""
+        mask = 0
+        for role in roles:
+            mask |= ROLE_BITS.get(role, 0)
+
+        return mask
+
+    @property
+    def role_mask(self) -> int:
+        """Returns the bitmask of the well known roles of this node."""
+        return self.compute_role_mask(self.roles)
+
+    @property
+    def role_set(self) -> FrozenSet[str]:
+        """Returns the roles of this node as a set."""
+        return frozenset(self.roles)
 
     def is_cm_eligible(self):
         """Returns whether this node is a cluster manager eligible member."""
@@ -4,15 +4,15 @@
 """Base class for the OpenSearch Operators."""
 import logging
 import random
+import time
 from abc import abstractmethod
 from datetime import datetime
-from typing import Dict, List, Optional, Type
+from typing import Dict, FrozenSet, List, Optional, Tuple, Type
 
 from charms.grafana_agent.v0.cos_agent import COSAgentProvider
 from charms.opensearch.v0.constants_charm import (
     AdminUserInitProgress,
     CertsExpirationError,
-    ClientRelationName,
     ClusterHealthRed,
     ClusterHealthUnknown,
     COSPort,
@@ -23,6 +23,7 @@ from charms.opensearch.v0.constants_charm import (
     PluginConfigChangeError,
     PluginConfigStart,
     RequestUnitServiceOps,
+    SecurityIndexInitError,
     SecurityIndexInitProgress,
     ServiceIsStopping,
     ServiceStartError,
@@ -34,7 +35,11 @@ from charms.opensearch.v0.constants_charm import (
 )
 from charms.opensearch.v0.constants_secrets import ADMIN_PW, ADMIN_PW_HASH
 from charms.opensearch.v0.constants_tls import TLS_RELATION, CertType
-from charms.opensearch.v0.helper_charm import DeferTriggerEvent, Status
+from charms.opensearch.v0.helper_charm import (
+    DeferTriggerEvent,
+    RecomputeRolesEvent,
+    Status,
+)
 from charms.opensearch.v0.helper_cluster import ClusterTopology, Node
 from charms.opensearch.v0.helper_networking import (
     get_host_ip,
@@ -52,6 +57,7 @@ from charms.opensearch.v0.opensearch_backups import OpenSearchBackup
 from charms.opensearch.v0.opensearch_config import OpenSearchConfig
 from charms.opensearch.v0.opensearch_distro import OpenSearchDistribution
 from charms.opensearch.v0.opensearch_exceptions import (
+    OpenSearchCmdError,
     OpenSearchError,
     OpenSearchHAError,
     OpenSearchHttpError,
@@ -70,6 +76,7 @@ from charms.opensearch.v0.opensearch_nodes_exclusions import (
     OpenSearchExclusions,
 )
 from charms.opensearch.v0.opensearch_peer_clusters import (
+    DeploymentDescription,
     OpenSearchPeerClustersManager,
     OpenSearchProvidedRolesException,
     StartMode,
@@ -98,7 +105,7 @@ from ops.charm import (
     StorageDetachingEvent,
     UpdateStatusEvent,
 )
-from ops.framework import EventBase, EventSource
+from ops.framework import EventBase, EventSource, StoredState
 from ops.model import BlockedStatus, MaintenanceStatus, WaitingStatus
 
 # The unique Charmhub library identifier, never change it
@@ -115,6 +122,9 @@ LIBPATCH = 2
 SERVICE_MANAGER = "service"
 STORAGE_NAME = "opensearch-data"
 
+# seconds after which the securityadmin script gets killed
+SECURITY_ADMIN_TIMEOUT = 300
+
 
 logger = logging.getLogger(__name__)
 
@@ -123,9 +133,17 @@ class OpenSearchBaseCharm(CharmBase):
     """Base class for OpenSearch charms."""
 
     defer_trigger_event = EventSource(DeferTriggerEvent)
+    recompute_roles_event = EventSource(RecomputeRolesEvent)
+
+    _stored = StoredState()
+
+    # names of the callbacks run by the rolling ops manager once the lock is granted
+    START_CALLBACK = "_start_opensearch"
+    RESTART_CALLBACK = "_restart_opensearch"
 
     def __init__(self, *args, distro: Type[OpenSearchDistribution] = None):
         super().__init__(*args)
+        self._stored.set_default(plugins_config_fingerprint=None)
 
         if distro is None:
             raise ValueError("The type of the opensearch distro must be specified.")
@@ -162,6 +180,12 @@ class OpenSearchBaseCharm(CharmBase):
 
         # helper to defer events without any additional logic
         self.framework.observe(self.defer_trigger_event, self._on_defer_trigger)
+        self._defer_trigger_emitted = False
+
+        # candidate alternative hosts and the reachable ones among them, probed once per hook
+        self._reachable_alt_hosts: Optional[Tuple[FrozenSet[str], List[str]]] = None
+
+        self.framework.observe(self.recompute_roles_event, self._on_recompute_roles)
 
         self.framework.observe(self.on.leader_elected, self._on_leader_elected)
         self.framework.observe(self.on.start, self._on_start)
@@ -186,11 +210,38 @@ class OpenSearchBaseCharm(CharmBase):
 
         self.framework.observe(self.on.set_password_action, self._on_set_password_action)
         self.framework.observe(self.on.get_password_action, self._on_get_password_action)
+        self.framework.observe(
+            self.on.retry_security_index_init_action, self._on_retry_security_index_init_action
+        )
 
     def _on_defer_trigger(self, _: DeferTriggerEvent):
         """Hook for the trigger_defer event."""
         pass
 
+    def _emit_defer_trigger(self) -> None:
+        """Emit the defer_trigger event, at most once per hook.
+
+        A single emission is enough to force the retry of the deferred events, any
+        other would only save and run one more no-op notice.
+        """
+        if self._defer_trigger_emitted:
+            return
+
+        self._defer_trigger_emitted = True
+        self.defer_trigger_event.emit()
+
+    def _request_service_op(self, callback_name: str) -> None:
+        """Request the rolling ops lock to run the given callback.
+
+        Every call requests the lock: an earlier request of the same hook may already have
+        been granted and run, and a repeated request only rewrites the same lock state.
+
+        Args:
+            callback_name: name of the charm method run once the lock is granted,
+                           i.e: START_CALLBACK or RESTART_CALLBACK
+        """
+        self.on[self.service_manager.name].acquire_lock.emit(callback_override=callback_name)
+
     def _on_leader_elected(self, event: LeaderElectedEvent):
         """Handle leader election event."""
         if self.peers_data.get(Scope.APP, "security_index_initialised", False):
@@ -250,7 +301,7 @@ class OpenSearchBaseCharm(CharmBase):
 
         # request the start of OpenSearch
         self.status.set(WaitingStatus(RequestUnitServiceOps.format("start")))
-        self.on[self.service_manager.name].acquire_lock.emit(callback_override="_start_opensearch")
+        self._request_service_op(self.START_CALLBACK)
 
     def _apply_peer_cm_directives_and_start(self) -> bool:
         """Apply the directives computed by the opensearch peer cluster manager."""
@@ -261,8 +312,7 @@ class OpenSearchBaseCharm(CharmBase):
         # check possibility to start
         if self.opensearch_peer_cm.can_start(deployment_desc):
             try:
-                nodes = self._get_nodes(False)
-                self.opensearch_peer_cm.validate_roles(nodes, on_new_unit=True)
+                self._get_validated_nodes_for_start(deployment_desc)
             except OpenSearchHttpError:
                 return False
             except OpenSearchProvidedRolesException as e:
@@ -271,9 +321,7 @@ class OpenSearchBaseCharm(CharmBase):
 
             # request the start of OpenSearch
             self.status.set(WaitingStatus(RequestUnitServiceOps.format("start")))
-            self.on[self.service_manager.name].acquire_lock.emit(
-                callback_override="_start_opensearch"
-            )
+            self._request_service_op(self.START_CALLBACK)
             return True
 
         if self.unit.is_leader():
@@ -323,29 +371,39 @@ class OpenSearchBaseCharm(CharmBase):
             return
 
         # we want to re-calculate the topology only once when latest unit joins
-        if len(nodes) == self.app.planned_units():
-            self._compute_and_broadcast_updated_topology(nodes)
+        if len(nodes) == (planned_units := self.app.planned_units()):
+            self._compute_and_broadcast_updated_topology(nodes, planned_units)
         else:
             event.defer()
 
+    def _on_recompute_roles(self, event: RecomputeRolesEvent):
+        """Recompute the node roles, without the checks specific to a joining unit."""
+        if not self.unit.is_leader():
+            return
+
+        if not self.peers_data.get(Scope.APP, "security_index_initialised"):
+            return
+
+        self._recompute_roles_if_needed(event)
+
     def _on_peer_relation_changed(self, event: RelationChangedEvent):
         """Handle peer relation changes."""
-        if (
-            self.unit.is_leader()
-            and self.opensearch.is_node_up()
-            and self.health.apply() in [HealthColors.UNKNOWN, HealthColors.YELLOW_TEMP]
+        rel_data = event.relation.data
+        app_data = rel_data.get(event.app)
+        unit_data = rel_data.get(event.unit) or {}
+
+        if self._leader_is_operational() and (
+            self.health.apply() in [HealthColors.UNKNOWN, HealthColors.YELLOW_TEMP]
         ):
             # we defer because we want the temporary status to be updated
             event.defer()
-            self.defer_trigger_event.emit()
+            self._emit_defer_trigger()
 
-        for relation in self.model.relations.get(ClientRelationName, []):
-            self.opensearch_provider.update_endpoints(relation)
+        self.opensearch_provider.update_all_endpoints()
 
         # register new cm addresses on every node
         self._add_cm_addresses_to_conf()
 
-        app_data = event.relation.data.get(event.app)
         if self.unit.is_leader():
             # Recompute the node roles in case self-healing didn't trigger leader related event
             self._recompute_roles_if_needed(event)
@@ -353,10 +411,6 @@ class OpenSearchBaseCharm(CharmBase):
             # if app_data + app_data["nodes_config"]: Reconfigure + restart node on the unit
             self._reconfigure_and_restart_unit_if_needed()
 
-        unit_data = event.relation.data.get(event.unit)
-        if not unit_data:
-            return
-
         if unit_data.get(VOTING_TO_DELETE) or unit_data.get(ALLOCS_TO_DELETE):
             self.opensearch_exclusions.cleanup()
 
@@ -366,36 +420,38 @@ class OpenSearchBaseCharm(CharmBase):
 
     def _on_peer_relation_departed(self, event: RelationDepartedEvent):
         """Relation departed event."""
-        if not (self.unit.is_leader() and self.opensearch.is_node_up()):
+        if not self._leader_is_operational():
             return
 
-        remaining_nodes = [
-            node
-            for node in self._get_nodes(True)
-            if node.name != event.departing_unit.name.replace("/", "-")
-        ]
+        nodes_by_name = self._get_nodes_by_name(True)
+        nodes_by_name.pop(event.departing_unit.name.replace("/", "-"), None)
 
-        if len(remaining_nodes) == self.app.planned_units():
-            self._compute_and_broadcast_updated_topology(remaining_nodes)
-        else:
+        if len(nodes_by_name) != (planned_units := self.app.planned_units()):
             event.defer()
+            return
+
+        self._compute_and_broadcast_updated_topology(list(nodes_by_name.values()), planned_units)
 
     def _on_opensearch_data_storage_detaching(self, _: StorageDetachingEvent):  # noqa: C901
         """Triggered when removing unit, Prior to the storage being detached."""
         # acquire lock to ensure only 1 unit removed at a time
         self.ops_lock.acquire()
 
+        # goal-state hook tool call, the value does not change over the hook
+        planned_units = self.app.planned_units()
+
         # if the leader is departing, and this hook fails "leader elected" won"t trigger,
         # so we want to re-balance the node roles from here
         if self.unit.is_leader():
-            if self.app.planned_units() > 1 and (self.opensearch.is_node_up() or self.alt_hosts):
-                remaining_nodes = [
-                    node
-                    for node in self._get_nodes(self.opensearch.is_node_up())
-                    if node.name != self.unit_name
-                ]
-                self._compute_and_broadcast_updated_topology(remaining_nodes)
-            elif self.app.planned_units() == 0:
+            if planned_units > 1 and (
+                (node_is_up := self.opensearch.is_node_up()) or self.alt_hosts
+            ):
+                nodes_by_name = self._get_nodes_by_name(node_is_up)
+                nodes_by_name.pop(self.unit_name, None)
+                self._compute_and_broadcast_updated_topology(
+                    list(nodes_by_name.values()), planned_units
+                )
+            elif planned_units == 0:
                 self.peers_data.delete(Scope.APP, "bootstrap_contributors_count")
                 self.peers_data.delete(Scope.APP, "nodes_config")
 
@@ -413,7 +469,7 @@ class OpenSearchBaseCharm(CharmBase):
             self._stop_opensearch()
 
             # safeguards in case planned_units > 0
-            if self.app.planned_units() > 0:
+            if planned_units > 0:
                 # check cluster status
                 if self.alt_hosts:
                     health_color = self.health.apply(
@@ -459,8 +515,7 @@ class OpenSearchBaseCharm(CharmBase):
             if health == HealthColors.UNKNOWN:
                 return
 
-        for relation in self.model.relations.get(ClientRelationName, []):
-            self.opensearch_provider.update_endpoints(relation)
+        self.opensearch_provider.update_all_endpoints()
 
         self.user_manager.remove_users_and_roles()
 
@@ -473,7 +528,8 @@ class OpenSearchBaseCharm(CharmBase):
 
     def _on_config_changed(self, event: ConfigChangedEvent):
         """On config changed event. Useful for IP changes or for user provided config changes."""
-        if self.opensearch_config.update_host_if_needed():
+        host_changed = self.opensearch_config.update_host_if_needed()
+        if host_changed:
             self.status.set(MaintenanceStatus(TLSNewCertsRequested))
             self._delete_stored_tls_resources()
             self.tls.request_new_unit_certificates()
@@ -481,9 +537,7 @@ class OpenSearchBaseCharm(CharmBase):
             # since when an IP change happens, "_on_peer_relation_joined" won't be called,
             # we need to alert the leader that it must recompute the node roles for any unit whose
             # roles were changed while the current unit was cut-off from the rest of the network
-            self.on[PeerRelationName].relation_joined.emit(
-                self.model.get_relation(PeerRelationName)
-            )
+            self.recompute_roles_event.emit()
 
         if self.unit.is_leader():
             # run peer cluster manager processing
@@ -493,12 +547,19 @@ class OpenSearchBaseCharm(CharmBase):
             event.defer()
             return
 
+        plugins_fingerprint = self._plugins_config_fingerprint()
+        if (
+            plugins_fingerprint
+            and not host_changed
+            and plugins_fingerprint == self._stored.plugins_config_fingerprint
+        ):
+            # config-changed is also fired by juju on its own, nothing to reconcile
+            return
+
         self.status.set(MaintenanceStatus(PluginConfigStart))
         try:
             if self.plugin_manager.run():
-                self.on[self.service_manager.name].acquire_lock.emit(
-                    callback_override="_restart_opensearch"
-                )
+                self._request_service_op(self.RESTART_CALLBACK)
         except OpenSearchNotFullyReadyError:
             logger.warning("Plugin management: cluster not ready yet at config changed")
             event.defer()
@@ -509,6 +570,16 @@ class OpenSearchBaseCharm(CharmBase):
             return
         self.status.clear(PluginConfigChangeError)
         self.status.clear(PluginConfigStart)
+        if plugins_fingerprint:
+            self._stored.plugins_config_fingerprint = plugins_fingerprint
+
+    def _plugins_config_fingerprint(self) -> Optional[str]:
+        """Returns the fingerprint of the plugins inputs, None if it cannot be computed."""
+        try:
+            return self.plugin_manager.config_fingerprint()
+        except OpenSearchPluginError:
+            # the installed plugins could not be listed, let plugin_manager.run() handle it
+            return None
 
     def _on_set_password_action(self, event: ActionEvent):
         """Set new admin password from user input or generate if not passed."""
@@ -554,6 +625,23 @@ class OpenSearchBaseCharm(CharmBase):
             }
         )
 
+    def _on_retry_security_index_init_action(self, event: ActionEvent):
+        """Run the initialization of the security index again after a failed run."""
+        if not self.unit.is_leader():
+            event.fail("The action can be run only on leader unit.")
+            return
+
+        if not self.peers_data.get(Scope.APP, "security_index_init_failed", False):
+            event.fail("The initialization of the security index did not fail.")
+            return
+
+        self.peers_data.delete(Scope.APP, "security_index_init_failed")
+        self.status.clear(SecurityIndexInitError)
+
+        # the service is already started: the start callback resumes at the post start init
+        self._request_service_op(self.START_CALLBACK)
+        event.set_results({"result": "The security index initialization will be retried."})
+
     def on_tls_conf_set(
         self, _: CertificateAvailableEvent, scope: Scope, cert_type: CertType, renewal: bool
     ):
@@ -578,9 +666,7 @@ class OpenSearchBaseCharm(CharmBase):
 
         # In case of renewal of the unit transport layer cert - restart opensearch
         if renewal and self._is_tls_fully_configured():
-            self.on[self.service_manager.name].acquire_lock.emit(
-                callback_override="_restart_opensearch"
-            )
+            self._request_service_op(self.RESTART_CALLBACK)
 
     def on_tls_relation_broken(self, _: RelationBrokenEvent):
         """As long as all certificates are produced, we don't do anything."""
@@ -590,13 +676,18 @@ class OpenSearchBaseCharm(CharmBase):
         # Otherwise, we block.
         self.status.set(BlockedStatus(TLSRelationBrokenError))
 
-    def _is_tls_fully_configured(self) -> bool:
-        """Check if TLS fully configured meaning the admin user configured & 3 certs present."""
+    def _is_tls_fully_configured(self, admin_secrets: Optional[Dict[str, str]] = None) -> bool:
+        """Check if TLS fully configured meaning the admin user configured & 3 certs present.
+
+        Args:
+            admin_secrets: the app admin cert secrets, if already fetched by the caller
+        """
         # In case the initialisation of the admin user is not finished yet
         if not self.peers_data.get(Scope.APP, "admin_user_initialized"):
             return False
 
-        admin_secrets = self.secrets.get_object(Scope.APP, CertType.APP_ADMIN.val)
+        if admin_secrets is None:
+            admin_secrets = self.secrets.get_object(Scope.APP, CertType.APP_ADMIN.val)
         if not admin_secrets or not admin_secrets.get("cert") or not admin_secrets.get("chain"):
             return False
 
@@ -617,7 +708,7 @@ class OpenSearchBaseCharm(CharmBase):
                 self._post_start_init()
             except (OpenSearchHttpError, OpenSearchNotFullyReadyError):
                 event.defer()
-                self.defer_trigger_event.emit()
+                self._emit_defer_trigger()
             return
 
         if not self._can_service_start():
@@ -625,7 +716,7 @@ class OpenSearchBaseCharm(CharmBase):
             event.defer()
 
             # emit defer trigger event which won't do anything to force retry of current event
-            self.defer_trigger_event.emit()
+            self._emit_defer_trigger()
             return
 
         if self.peers_data.get(Scope.UNIT, "starting", False) and self.opensearch.is_failed():
@@ -635,23 +726,24 @@ class OpenSearchBaseCharm(CharmBase):
 
         self.unit.status = WaitingStatus(WaitingToStart)
 
+        # the current unit is checked first: its data bag was already loaded above, while
+        # the data bag of each remote unit costs a relation-get call on first access
         rel = self.model.get_relation(PeerRelationName)
-        for unit in rel.units.union({self.unit}):
-            if rel.data[unit].get("starting") == "True":
-                event.defer()
-                return
+        if any(rel.data[unit].get("starting") == "True" for unit in [self.unit, *rel.units]):
+            event.defer()
+            return
 
         self.peers_data.put(Scope.UNIT, "starting", True)
 
         try:
-            # Retrieve the nodes of the cluster, needed to configure this node
-            nodes = self._get_nodes(False)
+            # goal-state hook tool call, shared by the roles validation and the node conf
+            planned_units = self.app.planned_units()
 
-            # validate the roles prior to starting
-            self.opensearch_peer_cm.validate_roles(nodes, on_new_unit=True)
+            # Retrieve the nodes of the cluster, needed to configure this node
+            nodes = self._get_validated_nodes_for_start(planned_units=planned_units)
 
             # Set the configuration of the node
-            self._set_node_conf(nodes)
+            self._set_node_conf(nodes, planned_units)
         except OpenSearchHttpError:
             self.peers_data.delete(Scope.UNIT, "starting")
             event.defer()
@@ -675,13 +767,13 @@ class OpenSearchBaseCharm(CharmBase):
         except (OpenSearchStartTimeoutError, OpenSearchNotFullyReadyError):
             event.defer()
             # emit defer_trigger event which won't do anything to force retry of current event
-            self.defer_trigger_event.emit()
+            self._emit_defer_trigger()
         except OpenSearchStartError as e:
             logger.exception(e)
             self.peers_data.delete(Scope.UNIT, "starting")
             self.status.set(BlockedStatus(ServiceStartError))
             event.defer()
-            self.defer_trigger_event.emit()
+            self._emit_defer_trigger()
 
     def _post_start_init(self):
         """Initialization post OpenSearch start."""
@@ -690,7 +782,16 @@ class OpenSearchBaseCharm(CharmBase):
             Scope.APP, "security_index_initialised"
         ):
             admin_secrets = self.secrets.get_object(Scope.APP, CertType.APP_ADMIN.val)
-            self._initialize_security_index(admin_secrets)
+            try:
+                initialized = self._initialize_security_index(admin_secrets)
+            except OpenSearchCmdError as e:
+                # the unit is blocked: not deferred, as retrying must not run the script again
+                logger.error(e)
+                self.peers_data.delete(Scope.UNIT, "starting")
+                return
+
+            if not initialized:
+                raise OpenSearchNotFullyReadyError("Security index initialization in progress.")
             self.peers_data.put(Scope.APP, "security_index_initialised", True)
 
         # it sometimes takes a few seconds before the node is fully "up" otherwise a 503 error
@@ -791,9 +892,10 @@ class OpenSearchBaseCharm(CharmBase):
             # internal_users.yml hasn't been initialised yet, so skip purging for now.
             return
 
-        for user in internal_users:
-            if user != "_meta":
-                self.opensearch.config.delete("opensearch-security/internal_users.yml", user)
+        users = [user for user in internal_users if user != "_meta"]
+        if users:
+            # a single rewrite of the file, rather than one per user
+            self.opensearch.config.delete_many("opensearch-security/internal_users.yml", users)
 
     def _put_admin_user(self, pwd: Optional[str] = None):
         """Change password of Admin user."""
@@ -850,11 +952,44 @@ class OpenSearchBaseCharm(CharmBase):
         )
         self.secrets.put(Scope.APP, self.secrets.password_key(COSUser), pwd)
 
-    def _initialize_security_index(self, admin_secrets: Dict[str, any]) -> None:
+    def _initialize_security_index(self, admin_secrets: Dict[str, any]) -> bool:
         """Run the security_admin script, it creates and initializes the opendistro_security index.
 
-        IMPORTANT: must only run once per cluster, otherwise the index gets overrode
+        The JVM backed script takes a while to complete: it is started in the background
+        and its completion checked on the next calls, made by the retries of the start.
+
+        IMPORTANT: must only run once per cluster, otherwise the index gets overrode.
+        A failed run is therefore never started again by the charm: the unit gets blocked
+        until the operator fixes the cause and runs the `retry-security-index-init` action.
+
+        Returns:
+            whether the security index is initialized.
+
+        Raises:
+            OpenSearchCmdError: if the script failed, now or on a previous run.
         """
+        script = "plugins/opensearch-security/tools/securityadmin.sh"
+        if self.peers_data.get(Scope.APP, "security_index_init_failed", False):
+            raise OpenSearchCmdError(f"{script} previously failed, not running it again.")
+
+        if (pid := self.peers_data.get(Scope.UNIT, "securityadmin_pid")) is not None:
+            try:
+                exit_code = self._securityadmin_exit_code(script, pid)
+            except OpenSearchCmdError:
+                self.peers_data.delete(Scope.UNIT, "securityadmin_pid")
+                self.peers_data.delete(Scope.UNIT, "securityadmin_started_at")
+                self.peers_data.put(Scope.APP, "security_index_init_failed", True)
+                self.status.set(BlockedStatus(SecurityIndexInitError))
+                raise
+
+            if exit_code is None:
+                return False
+
+            self.peers_data.delete(Scope.UNIT, "securityadmin_pid")
+            self.peers_data.delete(Scope.UNIT, "securityadmin_started_at")
+            self.status.clear(SecurityIndexInitProgress)
+            return True
+
         args = [
             f"-cd {self.opensearch.paths.conf}/opensearch-security/",
             f"-cn {self.app.name}-{self.model.name}",
@@ -869,10 +1004,30 @@ class OpenSearchBaseCharm(CharmBase):
             args.append(f"-keypass {admin_key_pwd}")
 
         self.status.set(MaintenanceStatus(SecurityIndexInitProgress))
-        self.opensearch.run_script(
-            "plugins/opensearch-security/tools/securityadmin.sh", " ".join(args)
+        self.peers_data.put(Scope.UNIT, "securityadmin_started_at", int(time.time()))
+        self.peers_data.put(
+            Scope.UNIT,
+            "securityadmin_pid",
+            self.opensearch.start_script(script, SECURITY_ADMIN_TIMEOUT, " ".join(args)),
         )
-        self.status.clear(SecurityIndexInitProgress)
+        return False
+
+    def _securityadmin_exit_code(self, script: str, pid: int) -> Optional[int]:
+        """Returns the exit code of the securityadmin run of this unit, None if still running.
+
+        Raises:
+            OpenSearchCmdError: if the run failed, terminated unexpectedly or is overdue.
+        """
+        exit_code = self.opensearch.script_exit_code(script, pid)
+        if exit_code is None:
+            started_at = self.peers_data.get(Scope.UNIT, "securityadmin_started_at", 0)
+            # timeout(1) kills the script past SECURITY_ADMIN_TIMEOUT, it cannot still be running
+            if time.time() - started_at > SECURITY_ADMIN_TIMEOUT + 60:
+                raise OpenSearchCmdError(f"{script} (pid: {pid}) did not complete in time.")
+        elif exit_code != 0:
+            raise OpenSearchCmdError(f"{script} failed with exit code: {exit_code}")
+
+        return exit_code
 
     def _get_nodes(self, use_localhost: bool) -> List[Node]:
         """Fetch the list of nodes of the cluster, depending on the requester."""
@@ -884,7 +1039,39 @@ class OpenSearchBaseCharm(CharmBase):
 
         return ClusterTopology.nodes(self.opensearch, use_localhost, self.alt_hosts)
 
-    def _set_node_conf(self, nodes: List[Node]) -> None:
+    def _leader_is_operational(self) -> bool:
+        """Whether the current unit is the leader, with its OpenSearch node up."""
+        return self.unit.is_leader() and self.opensearch.is_node_up()
+
+    def _get_nodes_by_name(self, use_localhost: bool) -> Dict[str, Node]:
+        """Fetch the nodes of the cluster, indexed by name (in the order returned by the API)."""
+        return {node.name: node for node in self._get_nodes(use_localhost)}
+
+    def _get_validated_nodes_for_start(
+        self,
+        deployment_desc: Optional[DeploymentDescription] = None,
+        planned_units: Optional[int] = None,
+    ) -> List[Node]:
+        """Fetch the nodes of the cluster once and validate the roles of this unit against them.
+
+        The nodes are not kept across the rolling-ops lock: other units may have joined
+        or left the cluster by the time the lock is granted.
+
+        Args:
+            deployment_desc: the deployment description if already read in the hook
+            planned_units: the planned units of the app if already read in the hook
+
+        Raises:
+            OpenSearchHttpError: if the nodes could not be fetched
+            OpenSearchProvidedRolesException: if the roles break the CM quorum
+        """
+        nodes = self._get_nodes(False)
+        self.opensearch_peer_cm.validate_roles(
+            nodes, on_new_unit=True, deployment_desc=deployment_desc, planned_units=planned_units
+        )
+        return nodes
+
+    def _set_node_conf(self, nodes: List[Node], planned_units: Optional[int] = None) -> None:
         """Set the configuration of the current node / unit."""
         # retrieve the updated conf if exists
         update_conf = (self.peers_data.get_object(Scope.APP, "nodes_config") or {}).get(
@@ -893,20 +1080,21 @@ class OpenSearchBaseCharm(CharmBase):
         if update_conf:
             update_conf = Node.from_dict(update_conf)
 
+        if planned_units is None:
+            planned_units = self.app.planned_units()
+
         # set default generated roles, or the ones passed in the updated conf
-        if (
-            deployment_desc := self.opensearch_peer_cm.deployment_desc()
-        ).start == StartMode.WITH_PROVIDED_ROLES:
+        deployment_desc = self.opensearch_peer_cm.deployment_desc()
+        if deployment_desc.start == StartMode.WITH_PROVIDED_ROLES:
             computed_roles = deployment_desc.config.roles
         else:
             computed_roles = (
                 update_conf.roles
                 if update_conf
-                else ClusterTopology.suggest_roles(nodes, self.app.planned_units())
+                else ClusterTopology.suggest_roles(nodes, planned_units)
             )
 
-        cm_names = ClusterTopology.get_cluster_managers_names(nodes)
-        cm_ips = ClusterTopology.get_cluster_managers_ips(nodes)
+        cm_names, cm_ips = ClusterTopology.get_cluster_managers(nodes)
 
         contribute_to_bootstrap = False
         if "cluster_manager" in computed_roles:
@@ -914,7 +1102,7 @@ class OpenSearchBaseCharm(CharmBase):
             cm_ips.append(self.unit_ip)
 
             cms_in_bootstrap = self.peers_data.get(Scope.APP, "bootstrap_contributors_count", 0)
-            if cms_in_bootstrap < self.app.planned_units():
+            if cms_in_bootstrap < planned_units:
                 contribute_to_bootstrap = True
 
                 if self.unit.is_leader():
@@ -925,7 +1113,6 @@ class OpenSearchBaseCharm(CharmBase):
                 # indicates that this unit is part of the "initial cm nodes"
                 self.peers_data.put(Scope.UNIT, "bootstrap_contributor", True)
 
-        deployment_desc = self.opensearch_peer_cm.deployment_desc()
         self.opensearch_config.set_node(
             cluster_name=deployment_desc.config.cluster_name,
             unit_name=self.unit_name,
@@ -949,26 +1136,43 @@ class OpenSearchBaseCharm(CharmBase):
                 self.opensearch, use_localhost=self.opensearch.is_node_up(), hosts=self.alt_hosts
             )
             # update (append) CM IPs
-            self.opensearch_config.add_seed_hosts(
-                [node.ip for node in nodes if node.is_cm_eligible()]
-            )
+            self.opensearch_config.add_seed_hosts(ClusterTopology.get_cluster_managers_ips(nodes))
         except OpenSearchHttpError:
             return
 
-    def _reconfigure_and_restart_unit_if_needed(self):
-        """Reconfigure the current unit if a new config was computed for it, then restart."""
-        nodes_config = self.peers_data.get_object(Scope.APP, "nodes_config")
-        if not nodes_config:
-            return
+    def _reconfigure_and_restart_unit_if_needed(
+        self, nodes_config: Optional[Dict[str, Node]] = None
+    ):
+        """Reconfigure the current unit if a new config was computed for it, then restart.
+
+        Args:
+            nodes_config: the nodes config just broadcast by the leader, read from
+                          the app data bag if not set
+        """
+        if nodes_config is not None:
+            if not nodes_config:
+                return
+
+            cm_ips = ClusterTopology.get_cluster_managers_ips(nodes_config.values())
+            new_node_conf = nodes_config.get(self.unit_name)
+        else:
+            stored_nodes_config = self.peers_data.get_object(Scope.APP, "nodes_config")
+            if not stored_nodes_config:
+                return
 
-        nodes_config = {name: Node.from_dict(node) for name, node in nodes_config.items()}
+            # only the conf of the current unit is deserialized, other nodes are read raw
+            cm_ips = [
+                node["ip"]
+                for node in stored_nodes_config.values()
+                if "cluster_manager" in node["roles"]
+            ]
+            new_node_conf = stored_nodes_config.get(self.unit_name)
+            if new_node_conf:
+                new_node_conf = Node.from_dict(new_node_conf)
 
         # update (append) CM IPs
-        self.opensearch_config.add_seed_hosts(
-            [node.ip for node in list(nodes_config.values()) if node.is_cm_eligible()]
-        )
+        self.opensearch_config.add_seed_hosts(cm_ips)
 
-        new_node_conf = nodes_config.get(self.unit_name)
         if not new_node_conf:
             # the conf could not be computed / broadcast, because this node is
             # "starting" and is not online "yet" - either barely being configured (i.e. TLS)
@@ -977,38 +1181,38 @@ class OpenSearchBaseCharm(CharmBase):
 
         current_conf = self.opensearch_config.load_node()
         if (
-            sorted(current_conf["node.roles"]) == sorted(new_node_conf.roles)
+            set(current_conf["node.roles"]) == new_node_conf.role_set
             and current_conf.get("node.attr.temp") == new_node_conf.temperature
         ):
             # no conf change (roles for now)
             return
 
         self.status.set(WaitingStatus(WaitingToStart))
-        self.on[self.service_manager.name].acquire_lock.emit(
-            callback_override="_restart_opensearch"
-        )
+        self._request_service_op(self.RESTART_CALLBACK)
 
-    def _recompute_roles_if_needed(self, event: RelationChangedEvent):
+    def _recompute_roles_if_needed(self, event: EventBase):
         """Recompute node roles:self-healing that didn't trigger leader related event occurred."""
         try:
             nodes = self._get_nodes(self.opensearch.is_node_up())
-            if len(nodes) < self.app.planned_units():
+            if len(nodes) < (planned_units := self.app.planned_units()):
                 event.defer()
                 return
 
-            self._compute_and_broadcast_updated_topology(nodes)
+            self._compute_and_broadcast_updated_topology(nodes, planned_units)
         except OpenSearchHttpError:
             pass
 
-    def _compute_and_broadcast_updated_topology(self, current_nodes: List[Node]) -> None:
+    def _compute_and_broadcast_updated_topology(
+        self, current_nodes: List[Node], planned_units: Optional[int] = None
+    ) -> None:
         """Compute cluster topology and broadcast node configs (roles for now) to change if any."""
         if not current_nodes:
             return
 
-        current_reported_nodes = {
-            name: Node.from_dict(node)
-            for name, node in (self.peers_data.get_object(Scope.APP, "nodes_config") or {}).items()
-        }
+        # compared as stored, without deserializing each reported node
+        current_reported_nodes = self._normalized_nodes_config(
+            self.peers_data.get_object(Scope.APP, "nodes_config") or {}
+        )
 
         if (
             deployment_desc := self.opensearch_peer_cm.deployment_desc()
@@ -1028,38 +1232,54 @@ class OpenSearchBaseCharm(CharmBase):
                 for node in current_nodes
             }
             try:
-                self.opensearch_peer_cm.validate_roles(current_nodes, on_new_unit=False)
+                self.opensearch_peer_cm.validate_roles(
+                    current_nodes,
+                    on_new_unit=False,
+                    deployment_desc=deployment_desc,
+                    planned_units=planned_units,
+                )
             except OpenSearchProvidedRolesException as e:
                 logger.exception(e)
                 self.app.status = BlockedStatus(str(e))
 
-        if current_reported_nodes == updated_nodes:
+        updated_reported_nodes = self._normalized_nodes_config(
+            {name: node.to_dict() for name, node in updated_nodes.items()}
+        )
+        if current_reported_nodes == updated_reported_nodes:
             return
 
-        self.peers_data.put_object(Scope.APP, "nodes_config", updated_nodes)
+        self.peers_data.put_object(Scope.APP, "nodes_config", updated_reported_nodes)
 
         # all units will get a peer_rel_changed event, for leader we do as follows
-        self._reconfigure_and_restart_unit_if_needed()
+        self._reconfigure_and_restart_unit_if_needed(updated_nodes)
+
+    @staticmethod
+    def _normalized_nodes_config(
+        nodes_config: Dict[str, Dict[str, any]]
+    ) -> Dict[str, Dict[str, any]]:
+        """Returns the nodes config with sorted roles, as their order is not significant."""
+        return {
+            name: {**node, "roles": sorted(node["roles"])} for name, node in nodes_config.items()
+        }
 
     def _check_certs_expiration(self, event: UpdateStatusEvent) -> None:
         """Checks the certificates' expiration."""
-        date_format = "%Y-%m-%d %H:%M:%S"
-        last_cert_check = datetime.strptime(
-            self.peers_data.get(Scope.UNIT, "certs_exp_checked_at", "1970-01-01 00:00:00"),
-            date_format,
-        )
+        # POSIX timestamp of the last check
+        last_cert_check = self.peers_data.get(Scope.UNIT, "certs_exp_checked_at", 0)
+        if isinstance(last_cert_check, str):
+            # previously stored as a "%Y-%m-%d %H:%M:%S" local time
+            last_cert_check = datetime.fromisoformat(last_cert_check).timestamp()
 
         # See if the last check was made less than 6h ago, if yes - leave
-        if (datetime.now() - last_cert_check).seconds < 6 * 3600:
+        if time.time() - last_cert_check < 6 * 3600:
             return
 
-        certs = self.tls.get_unit_certificates()
-
-        # keep certificates that are expiring in less than 24h
-        for cert_type in list(certs.keys()):
-            hours = cert_expiration_remaining_hours(certs[cert_type])
-            if hours > 24 * 7:
-                del certs[cert_type]
+        # keep certificates that are expiring in less than 7 days
+        certs = {
+            cert_type: cert
+            for cert_type, cert in self.tls.get_unit_certificates().items()
+            if cert_expiration_remaining_hours(cert) <= 24 * 7
+        }
 
         if certs:
             missing = [cert.val for cert in certs.keys()]
@@ -1073,21 +1293,19 @@ class OpenSearchBaseCharm(CharmBase):
                     event.defer()
                     return
 
-        self.peers_data.put(
-            Scope.UNIT, "certs_exp_checked_at", datetime.now().strftime(date_format)
-        )
+        self.peers_data.put(Scope.UNIT, "certs_exp_checked_at", int(time.time()))
 
     def _scrape_config(self) -> List[Dict]:
         """Generates the scrape config as needed."""
-        app_secrets = self.secrets.get_object(Scope.APP, CertType.APP_ADMIN.val)
-        ca = app_secrets.get("ca-cert")
+        # fetched once and shared with the TLS check, which would otherwise fetch it again
+        app_secrets = self.secrets.get_object(Scope.APP, CertType.APP_ADMIN.val) or {}
         pwd = self.secrets.get(Scope.APP, self.secrets.password_key(COSUser))
         return [
             {
                 "metrics_path": "/_prometheus/metrics",
                 "static_configs": [{"targets": [f"{self.unit_ip}:{COSPort}"]}],
-                "tls_config": {"ca": ca},
-                "scheme": "https" if self._is_tls_fully_configured() else "http",
+                "tls_config": {"ca": app_secrets.get("ca-cert")},
+                "scheme": "https" if self._is_tls_fully_configured(app_secrets) else "http",
                 "basic_auth": {"username": f"{COSUser}", "password": f"{pwd}"},
             }
         ]
@@ -1128,10 +1346,16 @@ class OpenSearchBaseCharm(CharmBase):
     def alt_hosts(self) -> Optional[List[str]]:
         """Return an alternative host (of another node) in case the current is offline."""
         all_units_ips = units_ips(self, PeerRelationName)
-        all_hosts = list(all_units_ips.values())
-        random.shuffle(all_hosts)
-
-        if not all_hosts:
+        if not all_units_ips:
             return None
 
-        return reachable_hosts([host for host in all_hosts if host != self.unit_ip])
+        # probing each host is a socket connect (up to a 5s timeout), which is only done
+        # again if the set of peer hosts changed since the last call in the hook
+        candidates = frozenset(host for host in all_units_ips.values() if host != self.unit_ip)
+        if self._reachable_alt_hosts is None or self._reachable_alt_hosts[0] != candidates:
+            hosts = reachable_hosts(list(candidates))
+            # spreads the load across the peers, with an order kept for the rest of the hook
+            random.shuffle(hosts)
+            self._reachable_alt_hosts = (candidates, hosts)
+
+        return list(self._reachable_alt_hosts[1])
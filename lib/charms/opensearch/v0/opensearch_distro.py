@@ -89,6 +89,9 @@ class OpenSearchDistribution(ABC):
         self._charm = charm
         self._peer_relation_name = peer_relation_name
 
+        # HTTP session shared by the requests of the hook, to reuse the TLS connections
+        self._session: Optional[requests.Session] = None
+
     def install(self):
         """Install the package."""
         pass
@@ -120,6 +123,8 @@ class OpenSearchDistribution(ABC):
 
     def stop(self):
         """Stop OpenSearch."""
+        self._close_session()
+
         # stop the opensearch service
         self._stop_service()
 
@@ -172,13 +177,76 @@ class OpenSearchDistribution(ABC):
         script_path = f"{self.paths.bin}/{bin_script_name}"
         return self._run_cmd(script_path, args, stdin=stdin)
 
-    def run_script(self, script_name: str, args: str = None):
-        """Run script provided by Opensearch in another directory, relative to OPENSEARCH_HOME."""
+    def start_script(self, script_name: str, timeout: int, args: str = None) -> int:
+        """Start a script provided by Opensearch in the background, relative to OPENSEARCH_HOME.
+
+        The script outlives the current hook, its exit code is written in a file once
+        it terminates and is to be retrieved with `script_exit_code`.
+
+        Args:
+            script_name: script located relatively to OPENSEARCH_HOME to be executed
+            timeout: seconds after which the script gets killed
+            args: arguments passed to the script
+
+        Returns:
+            the pid of the process running the script
+        """
         script_path = f"{self.paths.home}/{script_name}"
         if not os.access(script_path, os.X_OK):
             self._run_cmd(f"chmod a+x {script_path}")
 
-        self._run_cmd(f"{script_path}", args)
+        script = os.path.basename(script_name)
+        exit_code_file = f"{self.paths.tmp}/{script}.exit_code"
+        pathlib.Path(exit_code_file).unlink(missing_ok=True)
+
+        command = f"timeout {timeout} {script_path}"
+        if args is not None:
+            command = f"{command} {args}"
+
+        logger.debug(f"Starting command: {command}")
+        with open(f"{self.paths.logs}/{script}.log", mode="w") as log_file:
+            process = subprocess.Popen(
+                f"{command}; echo $? > {exit_code_file}",
+                stdout=log_file,
+                stderr=subprocess.STDOUT,
+                shell=True,
+                env=os.environ,
+                start_new_session=True,
+            )
+
+        return process.pid
+
+    def script_exit_code(self, script_name: str, pid: int) -> Optional[int]:
+        """Get the exit code of a script started with `start_script`, None if still running.
+
+        Raises:
+            OpenSearchCmdError: if the process terminated without reporting its exit code.
+        """
+        exit_code_file = f"{self.paths.tmp}/{os.path.basename(script_name)}.exit_code"
+        running = self._is_script_process(pid, f"{self.paths.home}/{script_name}")
+
+        # checked after the process, which writes the file right before terminating
+        if exists(exit_code_file):
+            with open(exit_code_file, mode="r") as f:
+                return int(f.read().strip())
+
+        if not running:
+            raise OpenSearchCmdError(f"{script_name} (pid: {pid}) terminated unexpectedly.")
+
+        return None
+
+    @staticmethod
+    def _is_script_process(pid: int, script_path: str) -> bool:
+        """Whether the process of the given pid is alive and running the given script.
+
+        The pid alone is not enough: it may have been reused by an unrelated process
+        since the script was started, i.e. after a reboot of the machine / container.
+        """
+        try:
+            with open(f"/proc/{pid}/cmdline", mode="rb") as f:
+                return script_path.encode() in f.read()
+        except OSError:
+            return False
 
     def request(  # noqa
         self,
@@ -252,30 +320,25 @@ class OpenSearchDistribution(ABC):
                 raise OpenSearchHttpError()
 
             try:
-                with requests.Session() as s:
-                    s.auth = (
-                        "admin",
-                        self._charm.secrets.get(Scope.APP, ADMIN_PW),
+                # the credentials are passed on each request, as the admin password
+                # may be changed by an earlier request of the same hook
+                request_kwargs = {
+                    "method": method.upper(),
+                    "url": urls[0],
+                    "auth": ("admin", self._charm.secrets.get(Scope.APP, ADMIN_PW)),
+                    "verify": f"{self.paths.certs}/chain.pem",
+                    "headers": {
+                        "Accept": "application/json",
+                        "Content-Type": "application/json",
+                    },
+                    "timeout": (timeout, timeout),
+                }
+                if payload:
+                    request_kwargs["data"] = (
+                        json.dumps(payload) if not isinstance(payload, str) else payload
                     )
 
-                    request_kwargs = {
-                        "method": method.upper(),
-                        "url": urls[0],
-                        "verify": f"{self.paths.certs}/chain.pem",
-                        "headers": {
-                            "Accept": "application/json",
-                            "Content-Type": "application/json",
-                        },
-                        "timeout": (timeout, timeout),
-                    }
-                    if payload:
-                        request_kwargs["data"] = (
-                            json.dumps(payload) if not isinstance(payload, str) else payload
-                        )
-
-                    response = s.request(**request_kwargs)
-
-                    return response
+                return self._http_session().request(**request_kwargs)
             except (requests.exceptions.RequestException, urllib3.exceptions.HTTPError) as e:
                 logger.error(
                     f"Request {method} to {urls[0]} with payload: {payload} failed. "
@@ -304,6 +367,19 @@ class OpenSearchDistribution(ABC):
         except requests.JSONDecodeError:
             raise OpenSearchHttpError(response_body=resp.text)
 
+    def _http_session(self) -> requests.Session:
+        """Returns the HTTP session of the hook, kept open to reuse its pooled connections."""
+        if self._session is None:
+            self._session = requests.Session()
+
+        return self._session
+
+    def _close_session(self) -> None:
+        """Close the pooled connections, i.e: when the node they point to is stopped."""
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+
     def write_file(self, path: str, data: str, override: bool = True):
         """Persists data into file. Useful for files generated on the fly, such as certs etc."""
         if not override and exists(path):
@@ -440,22 +516,26 @@ class OpenSearchDistribution(ABC):
         """Checks the system requirements."""
         missing_requirements = []
 
-        max_map_count = int(subprocess.getoutput("sysctl vm.max_map_count").split("=")[-1].strip())
+        max_map_count = OpenSearchDistribution._sysctl("vm.max_map_count")
         if max_map_count < 262144:
             missing_requirements.append("vm.max_map_count should be at least 262144")
 
-        swappiness = int(subprocess.getoutput("sysctl vm.swappiness").split("=")[-1].strip())
+        swappiness = OpenSearchDistribution._sysctl("vm.swappiness")
         if swappiness > 0:
             missing_requirements.append("vm.swappiness should be 0")
 
-        tcp_retries = int(
-            subprocess.getoutput("sysctl net.ipv4.tcp_retries2").split("=")[-1].strip()
-        )
+        tcp_retries = OpenSearchDistribution._sysctl("net.ipv4.tcp_retries2")
         if tcp_retries > 5:
             missing_requirements.append("net.ipv4.tcp_retries2 should be 5")
 
         return missing_requirements
 
+    @staticmethod
+    def _sysctl(key: str) -> int:
+        """Read an integer kernel parameter straight from procfs, as sysctl does."""
+        with open(f"/proc/sys/{key.replace('.', '/')}", "r") as f:
+            return int(f.read().strip())
+
     @cached_property
     def version(self) -> str:
         """Returns the version number of this opensearch instance.
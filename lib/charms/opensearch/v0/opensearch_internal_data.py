@@ -7,6 +7,7 @@ import json
 import logging
 from abc import ABC, abstractmethod
 from ast import literal_eval
+from functools import lru_cache
 from typing import Any, Dict, Optional, Union
 
 from charms.opensearch.v0.helper_enums import BaseStrEnum
@@ -75,8 +76,14 @@ class DataStore(ABC):
         pass
 
     @staticmethod
+    @lru_cache(maxsize=256)
     def cast(str_val: str) -> Union[bool, int, float, str]:
-        """Cast a string to the corresponding primitive type."""
+        """Cast a string to the corresponding primitive type.
+
+        The result only depends on the (immutable) input and is itself immutable, it is
+        therefore memoized: the same keys are read over and over within a hook, and
+        literal_eval parses a full AST on every call.
+        """
         try:
             typed_val = literal_eval(str_val.capitalize())
             if type(typed_val) not in {bool, int, float, str}:
@@ -88,12 +95,18 @@ class DataStore(ABC):
 
     @staticmethod
     def put_or_delete(data: Dict[str, str], key: str, value: Optional[str]):
-        """Put data into the key/val data store or delete if value is None."""
+        """Put data into the key/val data store or delete if value is None.
+
+        Each write to a relation data bag is a relation-set hook tool call, writes of
+        unchanged values are skipped as they would be no-ops for juju anyway.
+        """
         if value is None:
             del data[key]
             return
 
-        data.update({key: str(value)})
+        value = str(value)
+        if data.get(key) != value:
+            data[key] = value
 
 
 class RelationDataStore(DataStore):
@@ -8,7 +8,7 @@ This module manages OpenSearch keystore access and lifecycle.
 import logging
 import os
 from abc import ABC
-from typing import Dict, List
+from typing import Dict, List, Optional
 
 from charms.opensearch.v0.opensearch_exceptions import (
     OpenSearchCmdError,
@@ -134,10 +134,19 @@ class OpenSearchKeystore(Keystore):
         super().__init__(charm)
         self._keytool = "opensearch-keystore"
 
+        # output of "opensearch-keystore list", until a key gets added or removed
+        self._keys: Optional[List[str]] = None
+
     def add(self, entries: Dict[str, str]) -> None:
         """Adds a given key to the "opensearch" keystore."""
         if not entries:
             return  # no key/value to add, no need to request reload of keystore either
+
+        # the values of multiple keys are read line by line from the stdin of a single call
+        if len(entries) > 1 and all(value and "\n" not in value for value in entries.values()):
+            self._add_many(entries)
+            return
+
         for key, value in entries.items():
             self._add(key, value)
 
@@ -145,19 +154,34 @@ class OpenSearchKeystore(Keystore):
         """Removes a given key from "opensearch" keystore."""
         if not entries:
             return  # no key/value to remove, no need to request reload of keystore either
+
+        if len(entries) > 1:
+            try:
+                self._delete_many(entries)
+                return
+            except OpenSearchKeystoreError as e:
+                if "does not exist in the keystore" not in str(e):
+                    raise
+                # nothing was removed: remove the existing keys one by one
+
         for key in entries:
             self._delete(key)
 
     def list(self, alias: str = None) -> List[str]:
         """Lists the keys available in opensearch's keystore."""
-        try:
-            return self._opensearch.run_bin(self._keytool, "list").split("\n")
-        except OpenSearchCmdError as e:
-            raise OpenSearchKeystoreError(str(e))
+        if self._keys is None:
+            try:
+                self._keys = self._opensearch.run_bin(self._keytool, "list").split("\n")
+            except OpenSearchCmdError as e:
+                raise OpenSearchKeystoreError(str(e))
+
+        return self._keys
 
     def _add(self, key: str, value: str):
         if not value:
             raise OpenSearchKeystoreError("Missing keystore value")
+
+        self._keys = None
         try:
             # Add newline to the end of the key, if missing
             value += "" if value.endswith("\n") else "\n"
@@ -165,7 +189,26 @@ class OpenSearchKeystore(Keystore):
         except OpenSearchCmdError as e:
             raise OpenSearchKeystoreError(str(e))
 
+    def _add_many(self, entries: Dict[str, str]) -> None:
+        self._keys = None
+        try:
+            self._opensearch.run_bin(
+                self._keytool,
+                f"add --force --stdin {' '.join(entries)}",
+                stdin="".join(f"{value}\n" for value in entries.values()),
+            )
+        except OpenSearchCmdError as e:
+            raise OpenSearchKeystoreError(str(e))
+
+    def _delete_many(self, keys: List[str]) -> None:
+        self._keys = None
+        try:
+            self._opensearch.run_bin(self._keytool, f"remove {' '.join(keys)}")
+        except OpenSearchCmdError as e:
+            raise OpenSearchKeystoreError(str(e))
+
     def _delete(self, key: str) -> None:
+        self._keys = None
         try:
             self._opensearch.run_bin(self._keytool, f"remove {key}")
         except OpenSearchCmdError as e:
@@ -278,9 +278,15 @@ class OpenSearchPeerClustersManager:
 
         return DeploymentDescription.from_dict(current_deployment_desc)
 
-    def validate_roles(self, nodes: List[Node], on_new_unit: bool = False) -> None:
+    def validate_roles(
+        self,
+        nodes: List[Node],
+        on_new_unit: bool = False,
+        deployment_desc: Optional[DeploymentDescription] = None,
+        planned_units: Optional[int] = None,
+    ) -> None:
         """Validate full-cluster wide the quorum for CM/voting_only nodes on services start."""
-        deployment_desc = self.deployment_desc()
+        deployment_desc = deployment_desc or self.deployment_desc()
         if not set(deployment_desc.config.roles) & {"cluster_manager", "voting_only"}:
             # the user is not adding any cm nor voting_only roles to the nodes
             return
@@ -290,7 +296,9 @@ class OpenSearchPeerClustersManager:
             return
 
         # validate the full-cluster wide count of cm+voting_only nodes to keep the quorum
-        current_cluster_planned_units = self._charm.app.planned_units()
+        current_cluster_planned_units = (
+            self._charm.app.planned_units() if planned_units is None else planned_units
+        )
         current_cluster_units = [
             unit.name.replace("/", "-")
             for unit in self._charm.model.get_relation(PeerRelationName).units
@@ -303,7 +311,8 @@ class OpenSearchPeerClustersManager:
             # this is not the latest unit to be brought online, we can continue
             return
 
-        voters = sum(1 for node in nodes if node.is_cm_eligible() or node.is_voting_only())
+        bitmaps = ClusterTopology.nodes_bitmap_by_role(nodes)
+        voters = (bitmaps["cluster_manager"] | bitmaps["voting_only"]).bit_count()
         if voters % 2 == (0 if on_new_unit else 1):
             # if validation called on new unit: it means it will start and maintain the quorum
             #    (called on the latest unit to be configured and brought online)
@@ -10,8 +10,12 @@ This class is instantiated at the operator level and is called at every relevant
 config-changed, upgrade, s3-credentials-changed, etc.
 """
 
+import functools
+import hashlib
+import json
 import logging
-from typing import Any, Dict, List, Optional
+from types import MappingProxyType
+from typing import Any, Dict, FrozenSet, Iterator, List, Optional, Tuple
 
 from charms.opensearch.v0.opensearch_exceptions import (
     OpenSearchCmdError,
@@ -30,6 +34,7 @@ from charms.opensearch.v0.opensearch_plugins import (
     OpenSearchPluginMissingConfigError,
     OpenSearchPluginMissingDepsError,
     OpenSearchPluginRemoveError,
+    OpenSearchPluginUserInputError,
     PluginState,
 )
 
@@ -47,18 +52,27 @@ LIBPATCH = 1
 logger = logging.getLogger(__name__)
 
 
-ConfigExposedPlugins = {
-    "opensearch-knn": {
-        "class": OpenSearchKnn,
-        "config": "plugin_opensearch_knn",
-        "relation": None,
-    },
-    "repository-s3": {
-        "class": OpenSearchBackupPlugin,
-        "config": None,
-        "relation": "s3-credentials",
-    },
-}
+# read-only: the plugins are only declared here, never registered at runtime
+ConfigExposedPlugins = MappingProxyType(
+    {
+        "opensearch-knn": {
+            "class": OpenSearchKnn,
+            "config": "plugin_opensearch_knn",
+            "relation": None,
+        },
+        "repository-s3": {
+            "class": OpenSearchBackupPlugin,
+            "config": None,
+            "relation": "s3-credentials",
+        },
+    }
+)
+
+
+@functools.lru_cache(maxsize=32)
+def _parse_version(version: str) -> Tuple[str, ...]:
+    """Splits a version string in its components, once per distinct version."""
+    return tuple(version.split("."))
 
 
 class OpenSearchPluginManager:
@@ -78,41 +92,65 @@ class OpenSearchPluginManager:
         self._keystore = OpenSearchKeystore(self._charm)
         self._event_scope = OpenSearchPluginEventScope.DEFAULT
 
+        # output of "opensearch-plugin list", until a plugin gets installed or removed
+        self._installed_plugins_cache: Optional[FrozenSet[str]] = None
+        # plugins built in the current event scope, until a plugin gets installed or removed
+        self._plugins_cache: Optional[List[OpenSearchPlugin]] = None
+        self._plugins_by_class: Dict[type, OpenSearchPlugin] = {}
+        # ConfigExposedPlugins entries by plugin class, indexed on first lookup
+        self._plugins_data_by_class: Optional[Dict[type, Dict[str, Any]]] = None
+
     def set_event_scope(self, event_scope: OpenSearchPluginEventScope) -> None:
         """Sets the event scope of the plugin manager.
 
         This method should be called at the start of each event handler.
         """
         self._event_scope = event_scope
+        self._invalidate_plugin_cache()
 
     def reset_event_scope(self) -> None:
         """Resets the event scope of the plugin manager to the default value."""
         self._event_scope = OpenSearchPluginEventScope.DEFAULT
+        self._invalidate_plugin_cache()
 
     @property
     def plugins(self) -> List[OpenSearchPlugin]:
         """Returns List of installed plugins."""
-        plugins_list = []
+        if self._plugins_cache is None:
+            self._plugins_cache = list(self.iter_plugins())
+        return self._plugins_cache
+
+    def iter_plugins(self) -> Iterator[OpenSearchPlugin]:
+        """Yields the exposed plugins, each one only built once reached."""
         for plugin_data in ConfigExposedPlugins.values():
-            new_plugin = plugin_data["class"](
-                self._plugins_path, extra_config=self._extra_conf(plugin_data)
-            )
-            plugins_list.append(new_plugin)
-        return plugins_list
+            yield self._build_plugin(plugin_data)
 
     def get_plugin(self, plugin_class: OpenSearchPlugin) -> OpenSearchPlugin:
         """Returns a given plugin based on its class."""
-        for plugin in self.plugins:
-            if isinstance(plugin, plugin_class):
-                return plugin
-        raise KeyError(f"Plugin manager did not find plugin: {plugin_class}")
+        if plugin_class not in self._plugins_by_class:
+            plugin_data = self._plugin_data(plugin_class)
+            # only the requested plugin is built, along with its relation / config lookups
+            self._plugins_by_class[plugin_class] = self._build_plugin(plugin_data)
+        return self._plugins_by_class[plugin_class]
 
     def get_plugin_status(self, plugin_class: OpenSearchPlugin) -> OpenSearchPlugin:
         """Returns a given plugin based on its class."""
-        for plugin in self.plugins:
-            if isinstance(plugin, plugin_class):
-                return self.status(plugin)
-        raise KeyError(f"Plugin manager did not find plugin: {plugin_class}")
+        return self.status(self.get_plugin(plugin_class))
+
+    def _plugin_data(self, plugin_class: OpenSearchPlugin) -> Dict[str, Any]:
+        """Returns the ConfigExposedPlugins entry of a plugin class, the first one if several."""
+        if self._plugins_data_by_class is None:
+            self._plugins_data_by_class = {}
+            for plugin_data in ConfigExposedPlugins.values():
+                self._plugins_data_by_class.setdefault(plugin_data["class"], plugin_data)
+
+        if plugin_class not in self._plugins_data_by_class:
+            raise KeyError(f"Plugin manager did not find plugin: {plugin_class}")
+        return self._plugins_data_by_class[plugin_class]
+
+    def _build_plugin(self, plugin_data: Dict[str, Any]) -> OpenSearchPlugin:
+        """Instantiates a plugin out of its ConfigExposedPlugins entry."""
+        return plugin_data["class"](self._plugins_path, extra_config=self._extra_conf(plugin_data))
 
     def _extra_conf(self, plugin_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Returns the config from the relation data of the target plugin if applies."""
@@ -121,13 +159,29 @@ class OpenSearchPluginManager:
         # If the plugin depends on the relation, it must have at least one unit to be considered
         # for enabling. Otherwise, relation.units == 0 means that the plugin has no remote units
         # and the relation may be going away.
-        if relation and relation.units:
-            return {
-                **relation.data[relation.app],
-                **self._charm_config,
-                "opensearch-version": self._opensearch.version,
+        extra_conf = dict(relation.data[relation.app]) if relation and relation.units else {}
+        extra_conf.update(self._charm_config)
+        extra_conf["opensearch-version"] = self._opensearch.version
+        return extra_conf
+
+    def config_fingerprint(self) -> str:
+        """Returns a digest of all the inputs of the plugins lifecycle.
+
+        Those are: the installed plugins, the charm config, the plugin relations and
+        their data as well as the opensearch version. Two equal fingerprints mean that
+        run() would have nothing to install, configure, disable or remove.
+        """
+        plugins_inputs = {
+            name: {
+                "relation-set": bool(self._is_plugin_relation_set(plugin_data["relation"])),
+                "config": self._extra_conf(plugin_data),
             }
-        return {**self._charm_config, "opensearch-version": self._opensearch.version}
+            for name, plugin_data in ConfigExposedPlugins.items()
+        }
+        serialized = json.dumps(
+            [sorted(self._installed_plugins()), plugins_inputs], sort_keys=True, default=str
+        )
+        return hashlib.sha256(serialized.encode()).hexdigest()
 
     def run(self) -> bool:
         """Runs a check on each plugin: install, execute config changes or remove.
@@ -154,21 +208,8 @@ class OpenSearchPluginManager:
             # not influence the execution of other plugins.
             # Capture them and raise all of them at the end.
             try:
-                restart_needed = any(
-                    [
-                        self._install_if_needed(plugin),
-                        self._configure_if_needed(plugin),
-                        self._disable_if_needed(plugin),
-                        self._remove_if_needed(plugin),
-                        restart_needed,
-                    ]
-                )
-            except (
-                OpenSearchPluginMissingDepsError,
-                OpenSearchPluginMissingConfigError,
-                OpenSearchPluginInstallError,
-                OpenSearchPluginRemoveError,
-            ) as e:
+                restart_needed = self._run_plugin_lifecycle(plugin) or restart_needed
+            except OpenSearchPluginUserInputError as e:
                 # This is a more serious issue, as we are missing some input from
                 # the user. The charm should block.
                 err_msgs.append(str(e))
@@ -179,31 +220,62 @@ class OpenSearchPluginManager:
             raise OpenSearchPluginError("\n".join(err_msgs))
         return restart_needed
 
-    def _install_plugin(self, plugin: OpenSearchPlugin) -> bool:
+    def _run_plugin_lifecycle(self, plugin: OpenSearchPlugin) -> bool:
+        """Runs the install, configure, disable and remove steps of a plugin, in that order.
+
+        The status of the plugin is computed once, then only again after a step that
+        may have changed it. Returns True if a restart is needed.
+        """
+        # the user request only depends on the charm config and relations
+        user_requested = self._user_requested_to_enable(plugin)
+
+        status = self.status(plugin)
+        restart_needed = self._install_if_needed(
+            plugin, user_requested=user_requested, status=status
+        )
+        if status == PluginState.MISSING:
+            status = self.status(plugin)
+
+        restart_needed = self._configure_if_needed(plugin, status=status) or restart_needed
+        if status == PluginState.INSTALLED:
+            status = self.status(plugin)
+
+        restart_needed = (
+            self._disable_if_needed(plugin, user_requested=user_requested, status=status)
+            or restart_needed
+        )
+        if status in [PluginState.ENABLED, PluginState.WAITING_FOR_UPGRADE] and not user_requested:
+            status = self.status(plugin)
+
+        return self._remove_if_needed(plugin, status=status) or restart_needed
+
+    def _install_plugin(
+        self, plugin: OpenSearchPlugin, user_requested: Optional[bool] = None
+    ) -> bool:
         """Install a plugin enabled via config/relation.
 
         Returns True if the plugin was installed.
         """
-        installed_plugins = self._installed_plugins()
+        # Check for dependencies
         if plugin.dependencies:
+            installed_plugins = self._installed_plugins()
             missing_deps = [dep for dep in plugin.dependencies if dep not in installed_plugins]
             if missing_deps:
                 raise OpenSearchPluginMissingDepsError(plugin.name, missing_deps)
 
         # Add the plugin
         try:
-            if self.status(plugin) != PluginState.MISSING or not self._user_requested_to_enable(
-                plugin
-            ):
+            if user_requested is None:
+                user_requested = self._user_requested_to_enable(plugin)
+
+            if self.status(plugin) != PluginState.MISSING or not user_requested:
                 # Nothing to do here
                 return False
 
-            # Check for dependencies
-            missing_deps = [dep for dep in plugin.dependencies if dep not in installed_plugins]
-            if missing_deps:
-                raise OpenSearchPluginMissingDepsError(plugin.name, missing_deps)
-
-            self._opensearch.run_bin("opensearch-plugin", f"install --batch {plugin.name}")
+            try:
+                self._opensearch.run_bin("opensearch-plugin", f"install --batch {plugin.name}")
+            finally:
+                self._invalidate_plugin_cache()
         except KeyError as e:
             raise OpenSearchPluginMissingConfigError(e)
         except OpenSearchCmdError as e:
@@ -215,24 +287,32 @@ class OpenSearchPluginManager:
         # Install successful
         return True
 
-    def _install_if_needed(self, plugin: OpenSearchPlugin) -> bool:
+    def _install_if_needed(
+        self,
+        plugin: OpenSearchPlugin,
+        user_requested: Optional[bool] = None,
+        status: Optional[PluginState] = None,
+    ) -> bool:
         """Installs all the plugins enabled via the config/relation.
 
         Check if plugin in status: PluginState.MISSING and config/relation is set.
         Returns True if the plugin was installed.
         """
-        if self.status(plugin) != PluginState.MISSING or not self._user_requested_to_enable(
-            plugin
-        ):
+        if user_requested is None:
+            user_requested = self._user_requested_to_enable(plugin)
+
+        if (status or self.status(plugin)) != PluginState.MISSING or not user_requested:
             # Nothing to do here
             return False
 
-        return self._install_plugin(plugin)
+        return self._install_plugin(plugin, user_requested=user_requested)
 
-    def _configure_if_needed(self, plugin: OpenSearchPlugin) -> bool:
+    def _configure_if_needed(
+        self, plugin: OpenSearchPlugin, status: Optional[PluginState] = None
+    ) -> bool:
         """Gathers all the configuration changes needed and applies them."""
         try:
-            if self.status(plugin) != PluginState.INSTALLED:
+            if (status or self.status(plugin)) != PluginState.INSTALLED:
                 # Leave this method if either user did not request to enable this plugin
                 # or plugin has been already enabled.
                 return False
@@ -240,10 +320,18 @@ class OpenSearchPluginManager:
         except KeyError as e:
             raise OpenSearchPluginMissingConfigError(plugin.name, configs=[f"{e}"])
 
-    def _disable_if_needed(self, plugin: OpenSearchPlugin) -> bool:
+    def _disable_if_needed(
+        self,
+        plugin: OpenSearchPlugin,
+        user_requested: Optional[bool] = None,
+        status: Optional[PluginState] = None,
+    ) -> bool:
         """If disabled, removes plugin configuration or sets it to other values."""
         try:
-            if self._user_requested_to_enable(plugin) or self.status(plugin) not in [
+            if user_requested is None:
+                user_requested = self._user_requested_to_enable(plugin)
+
+            if user_requested or (status or self.status(plugin)) not in [
                 PluginState.ENABLED,
                 PluginState.WAITING_FOR_UPGRADE,
             ]:
@@ -269,8 +357,16 @@ class OpenSearchPluginManager:
 
         Returns True if a configuration change was performed.
         """
-        self._keystore.delete(config.secret_entries_to_del)
-        self._keystore.add(config.secret_entries_to_add)
+        # keys about to be added are overwritten (forced), no need to remove them first
+        secret_entries_to_del = [
+            key for key in config.secret_entries_to_del if key not in config.secret_entries_to_add
+        ]
+        if secret_entries_to_del:
+            self._keystore.delete(secret_entries_to_del)
+
+        if config.secret_entries_to_add:
+            self._keystore.add(config.secret_entries_to_add)
+
         # Add and remove configuration if applies
         if config.config_entries_to_del:
             self._opensearch_config.delete_plugin(config.config_entries_to_del)
@@ -292,14 +388,14 @@ class OpenSearchPluginManager:
         if self._needs_upgrade(plugin):
             return PluginState.WAITING_FOR_UPGRADE
 
-        # The _user_request_to_enable comes first, as it ensures there is a relation/config
-        # set, which will be used by _is_enabled to determine if we are enabled or not.
-        if not self._user_requested_to_enable(plugin) and not self._is_enabled(plugin):
-            return PluginState.DISABLED
-
+        # _is_enabled only reads the extra config the plugin was built with, the user
+        # request is therefore only needed to tell a disabled plugin from an installed one.
         if self._is_enabled(plugin):
             return PluginState.ENABLED
 
+        if not self._user_requested_to_enable(plugin):
+            return PluginState.DISABLED
+
         return PluginState.INSTALLED
 
     def _is_installed(self, plugin: OpenSearchPlugin) -> bool:
@@ -309,8 +405,10 @@ class OpenSearchPluginManager:
     def _user_requested_to_enable(self, plugin: OpenSearchPlugin) -> bool:
         """Returns True if user requested plugin to be enabled."""
         plugin_data = ConfigExposedPlugins[plugin.name]
+        # relation-only plugins (e.g. repository-s3) have no config option to look up
+        config_name = plugin_data["config"]
         if not (
-            self._charm.config.get(plugin_data["config"], False)
+            (config_name and self._charm.config.get(config_name, False))
             or self._is_plugin_relation_set(plugin_data["relation"])
         ):
             # User asked to disable this plugin
@@ -331,12 +429,15 @@ class OpenSearchPluginManager:
         If they match in any of the cases above, then return True.
         """
         try:
-            plugin_conf = plugin.disable().config_entries_to_del
-            keystore_conf = plugin.disable().secret_entries_to_del
+            disable_config = plugin.disable()
+            plugin_conf = disable_config.config_entries_to_del
+            keystore_conf = disable_config.secret_entries_to_del
             stored_plugin_conf = self._opensearch_config.get_plugin(plugin_conf)
 
-            if any(k not in self._keystore.list() for k in keystore_conf):
-                return False
+            if keystore_conf:
+                keystore_keys = set(self._keystore.list())
+                if any(k not in keystore_keys for k in keystore_conf):
+                    return False
 
             # Using sets to guarantee matches; stored_plugin_conf will be a dict
             if isinstance(plugin_conf, list):
@@ -349,8 +450,8 @@ class OpenSearchPluginManager:
 
     def _needs_upgrade(self, plugin: OpenSearchPlugin) -> bool:
         """Returns true if plugin needs upgrade."""
-        plugin_version = plugin.version.split(".")
-        version = self._opensearch.version.split(".")
+        plugin_version = _parse_version(plugin.version)
+        version = _parse_version(self._opensearch.version)
         num_points = min(len(plugin_version), len(version))
         return version[:num_points] != plugin_version[:num_points]
 
@@ -363,9 +464,11 @@ class OpenSearchPluginManager:
             return relation is not None and relation.units
         return relation is not None
 
-    def _remove_if_needed(self, plugin: OpenSearchPlugin) -> bool:
+    def _remove_if_needed(
+        self, plugin: OpenSearchPlugin, status: Optional[PluginState] = None
+    ) -> bool:
         """If disabled, removes plugin configuration or sets it to other values."""
-        if self.status(plugin) == PluginState.DISABLED:
+        if (status or self.status(plugin)) == PluginState.DISABLED:
             if plugin.REMOVE_ON_DISABLE:
                 return self._remove_plugin(plugin)
         return False
@@ -379,11 +482,25 @@ class OpenSearchPluginManager:
                 logger.info(f"Plugin {plugin.name} to be deleted, not found. Continuing...")
                 return False
             raise OpenSearchPluginRemoveError(plugin.name)
+        finally:
+            self._invalidate_plugin_cache()
         return True
 
-    def _installed_plugins(self) -> List[str]:
-        """List plugins."""
-        try:
-            return self._opensearch.run_bin("opensearch-plugin", "list").split("\n")
-        except OpenSearchCmdError as e:
-            raise OpenSearchPluginError("Failed to list plugins: " + str(e))
+    def _installed_plugins(self) -> FrozenSet[str]:
+        """List plugins, the CLI is only called again once a plugin got installed / removed."""
+        if self._installed_plugins_cache is None:
+            try:
+                output = self._opensearch.run_bin("opensearch-plugin", "list")
+            except OpenSearchCmdError as e:
+                raise OpenSearchPluginError("Failed to list plugins: " + str(e))
+
+            # one plugin per line, without the empty entry of the trailing new line
+            self._installed_plugins_cache = frozenset(filter(None, output.split("\n")))
+
+        return self._installed_plugins_cache
+
+    def _invalidate_plugin_cache(self) -> None:
+        """Forget the installed and built plugins, to be called when they may have changed."""
+        self._installed_plugins_cache = None
+        self._plugins_cache = None
+        self._plugins_by_class = {}
@@ -258,8 +258,7 @@ class OpenSearchBaseCharm(CharmBase):
         if self.model.get_relation("my-plugin-relation") is not None:
             self.unit.status = self.my_plugin.status()
 
-        for relation in self.model.relations.get(ClientRelationName, []):
-            self.opensearch_provider.update_endpoints(relation)
+        self.opensearch_provider.update_all_endpoints()
 
         self.user_manager.remove_users_and_roles()
         # If relation not broken - leave
@@ -295,19 +294,23 @@ class OpenSearchPluginError(OpenSearchError):
     """Exception thrown when an opensearch plugin is invalid."""
 
 
-class OpenSearchPluginMissingDepsError(OpenSearchPluginError):
+class OpenSearchPluginUserInputError(OpenSearchPluginError):
+    """Base exception of the plugin errors that require an action from the user."""
+
+
+class OpenSearchPluginMissingDepsError(OpenSearchPluginUserInputError):
     """Exception thrown when an opensearch plugin misses installed dependencies."""
 
 
-class OpenSearchPluginInstallError(OpenSearchPluginError):
+class OpenSearchPluginInstallError(OpenSearchPluginUserInputError):
     """Exception thrown when opensearch plugin installation fails."""
 
 
-class OpenSearchPluginRemoveError(OpenSearchPluginError):
+class OpenSearchPluginRemoveError(OpenSearchPluginUserInputError):
     """Exception thrown when opensearch plugin removal fails."""
 
 
-class OpenSearchPluginMissingConfigError(OpenSearchPluginError):
+class OpenSearchPluginMissingConfigError(OpenSearchPluginUserInputError):
     """Exception thrown when config() or disable() fails to find a config key.
 
     The plugin itself should raise a KeyError, to avoid burden in the plugin development.
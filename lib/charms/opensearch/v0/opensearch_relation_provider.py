@@ -19,7 +19,7 @@ https://opensearch.org/docs/latest/security/access-control/index/.
 """
 import logging
 from enum import Enum
-from typing import Dict, Optional, Set
+from typing import Dict, List, Optional, Set
 
 from charms.data_platform_libs.v0.data_interfaces import (
     IndexRequestedEvent,
@@ -372,9 +372,23 @@ class OpenSearchProvider(Object):
 
     def update_endpoints(self, relation: Relation, omit_endpoints: Optional[Set[str]] = None):
         """Updates endpoints in the databag for the given relation."""
+        self.update_all_endpoints([relation], omit_endpoints)
+
+    def update_all_endpoints(
+        self,
+        relations: Optional[List[Relation]] = None,
+        omit_endpoints: Optional[Set[str]] = None,
+    ):
+        """Updates endpoints in the databags of the given relations (defaults to all clients).
+
+        The nodes of the cluster are fetched once, whatever the number of relations.
+        """
+        if relations is None:
+            relations = self.model.relations.get(self.relation_name, [])
+
         # we can only set endpoints if we're the leader, and we can only get endpoints if the node
         # is running.
-        if not self.unit.is_leader() or not self.opensearch.is_node_up():
+        if not relations or not self.unit.is_leader() or not self.opensearch.is_node_up():
             return
 
         if not omit_endpoints:
@@ -388,7 +402,8 @@ class OpenSearchProvider(Object):
 
         port = self.opensearch.port
         endpoints = ",".join([f"{ip}:{port}" for ip in ips - omit_endpoints])
-        databag_endpoints = relation.data[relation.app].get("endpoints")
 
-        if endpoints != databag_endpoints:
-            self.opensearch_provides.set_endpoints(relation.id, endpoints)
+        for relation in relations:
+            databag_endpoints = relation.data[relation.app].get("endpoints")
+            if endpoints != databag_endpoints:
+                self.opensearch_provides.set_endpoints(relation.id, endpoints)
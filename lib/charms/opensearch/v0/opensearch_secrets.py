@@ -12,6 +12,7 @@ information for the Opensearch charm.
 """
 
 import logging
+from functools import cached_property
 from typing import Dict, Optional, Union
 
 from charms.opensearch.v0.constants_secrets import PW_POSTFIX
@@ -81,7 +82,7 @@ class OpenSearchSecrets(Object, RelationDataStore):
         if not self._charm.unit.is_leader():
             self._charm.store_tls_resources(CertType.APP_ADMIN, event.secret.get_content())
 
-    @property
+    @cached_property
     def implements_secrets(self):
         """Property to cache results from a Juju call."""
         return JujuVersion.from_environ().has_secrets
@@ -142,7 +143,9 @@ class OpenSearchSecrets(Object, RelationDataStore):
         return secret
 
     def _get_juju_secret_content(self, scope: Scope, key: str) -> Optional[Dict[str, str]]:
-        cached_secret_content = self.cached_secrets.get_content(scope, self.label(scope, key))
+        label = self.label(scope, key)
+
+        cached_secret_content = self.cached_secrets.get_content(scope, label)
         if cached_secret_content:
             return cached_secret_content
 
@@ -151,7 +154,7 @@ class OpenSearchSecrets(Object, RelationDataStore):
             return None
 
         content = secret.get_content()
-        self.cached_secrets.put_content(scope, self.label(scope, key), content=content)
+        self.cached_secrets.put_content(scope, label, content=content)
         return content
 
     def _add_juju_secret(self, scope: Scope, key: str, value: Dict[str, str]) -> Optional[Secret]:
@@ -2,6 +2,7 @@
 # See LICENSE file for licensing details.
 
 """Unit test for the helper_cluster library."""
+import json
 import unittest
 from typing import List
 from unittest.mock import patch
@@ -157,6 +158,12 @@ class TestHelperCluster(unittest.TestCase):
             ["cm1", "cm2", "cm3", "cm4", "cm5"],
         )
 
+    def test_topology_get_cluster_managers(self):
+        """Test correct retrieval of cm names and ips from a list of nodes."""
+        names, ips = ClusterTopology.get_cluster_managers(self.cluster1_6_nodes_conf())
+        self.assertEqual(names, ["cm1", "cm2", "cm3", "cm4", "cm5"])
+        self.assertEqual(ips, ["0.0.0.1", "0.0.0.2", "0.0.0.3", "0.0.0.4", "0.0.0.5"])
+
     def test_topology_nodes_count_by_role(self):
         """Test correct mapping role / count of nodes with the role."""
         self.assertDictEqual(
@@ -170,6 +177,17 @@ class TestHelperCluster(unittest.TestCase):
             },
         )
 
+    def test_topology_nodes_bitmap_by_role(self):
+        """Test the per role bitmaps of nodes, where a node with several roles counts once."""
+        nodes = self.cluster1_6_nodes_conf()
+        nodes.append(
+            Node(name="vo1", roles=["voting_only", "custom"], ip="0.0.0.7", app_name=self.cluster1)
+        )
+
+        bitmaps = ClusterTopology.nodes_bitmap_by_role(nodes)
+        self.assertEqual(bitmaps["cluster_manager"], 0b0011111)
+        self.assertEqual((bitmaps["cluster_manager"] | bitmaps["voting_only"]).bit_count(), 6)
+
     def test_refill_node_with_default_roles(self):
         """Test the automatic suggestion of new roles to an existing node."""
         # First test with previously set roles in a cluster
@@ -241,3 +259,43 @@ class TestHelperCluster(unittest.TestCase):
         self.assertEqual(raw_node.name, from_json_node.name)
         self.assertEqual(raw_node.roles, from_json_node.roles)
         self.assertEqual(raw_node.ip, from_json_node.ip)
+
+    def test_node_role_mask(self):
+        """Test the computation of the role mask of a node."""
+        node = Node(name="cm1", roles=self.cm_roles, ip="0.0.0.11", app_name=self.cluster1)
+        self.assertTrue(node.is_cm_eligible())
+        self.assertFalse(node.is_voting_only())
+        self.assertEqual(node.role_mask, Node.compute_role_mask(self.cm_roles))
+        self.assertNotIn("role_mask", node.to_dict())
+
+        node = Node(
+            name="data1", roles=["data", "custom", "data"], ip="0.0.0.12", app_name=self.cluster1
+        )
+        self.assertEqual(node.roles, ["data", "custom"])
+
+        node = Node.from_dict(json.loads(json.dumps(node.to_dict())))
+        self.assertIs(node.roles[0], "data")
+        self.assertFalse(node.is_cm_eligible())
+        self.assertEqual(node.role_mask, Node.compute_role_mask(["data"]))
+
+        # the mask follows the changes made to the roles of the node
+        node.roles.append("cluster_manager")
+        self.assertTrue(node.is_cm_eligible())
+        self.assertEqual(node.role_mask, Node.compute_role_mask(["data", "cluster_manager"]))
+
+    def test_node_equality(self):
+        """Test nodes are equal regardless of the order of their roles."""
+        node = Node(name="n1", roles=["data", "ml"], ip="0.0.0.11", app_name=self.cluster1)
+        self.assertEqual(node.role_set, frozenset(["data", "ml"]))
+        self.assertNotIn("role_set", node.to_dict())
+
+        self.assertEqual(
+            node, Node(name="n1", roles=["ml", "data"], ip="0.0.0.11", app_name=self.cluster1)
+        )
+        self.assertNotEqual(
+            node, Node(name="n1", roles=["data"], ip="0.0.0.11", app_name=self.cluster1)
+        )
+        self.assertNotEqual(
+            node, Node(name="n1", roles=["data", "ml"], ip="0.0.0.12", app_name=self.cluster1)
+        )
+        self.assertNotEqual(node, None)
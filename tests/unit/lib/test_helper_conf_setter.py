@@ -4,6 +4,7 @@
 """Unit test for the helper_conf_setter library."""
 import os
 import unittest
+from unittest.mock import patch
 
 from charms.opensearch.v0.helper_conf_setter import YamlConfigSetter
 
@@ -82,6 +83,44 @@ class TestHelperConfSetter(unittest.TestCase):
         for elt in complex_array:
             self.assertNotEqual(elt["name"], "name1")
 
+    def test_delete_many(self):
+        """Test deleting multiple nodes from YAML doc in one go."""
+        input_file = "tests/unit/resources/test_conf.yaml"
+        output_file = "tests/unit/resources/produced.yaml"
+
+        self.conf.delete_many(
+            input_file,
+            ["simple_key", "non_existing_key", "obj/simple_array/[1]"],
+            output_file=output_file,
+        )
+        produced = self.conf.load(output_file)
+        self.assertFalse("simple_key" in produced)
+        self.assertFalse("elt2" in produced["obj"]["simple_array"])
+        self.assertTrue("multiline_array" in produced)
+
+    def test_load_cached(self):
+        """Test files are only parsed again when changed on disk."""
+        input_file = "tests/unit/resources/test_conf.yaml"
+        output_file = "tests/unit/resources/produced.yaml"
+
+        with patch.object(self.conf.yaml, "load", wraps=self.conf.yaml.load) as yaml_load:
+            # already parsed in setUp, mutations of the returned data are not cached
+            data = self.conf.load(input_file)
+            data["simple_key"] = "mutated"
+            self.assertNotEqual(self.conf.load(input_file)["simple_key"], "mutated")
+            yaml_load.assert_not_called()
+
+            # written files are cached
+            self.conf.put(input_file, "simple_key", "updated", output_file=output_file)
+            self.assertEqual(self.conf.load(output_file)["simple_key"], "updated")
+            yaml_load.assert_not_called()
+
+            # files changed by others are parsed again
+            with open(output_file, "a") as f:
+                f.write("other_key: other_val\n")
+            self.assertEqual(self.conf.load(output_file)["other_key"], "other_val")
+            yaml_load.assert_called_once()
+
     def tearDown(self) -> None:
         """Cleanup."""
         output = "tests/unit/resources/produced.yaml"
@@ -5,13 +5,16 @@
 
 import unittest
 import uuid
-from unittest.mock import MagicMock
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock, patch
 
 from charms.opensearch.v0.constants_charm import PeerRelationName
 from charms.opensearch.v0.helper_networking import (
+    MAX_REACHABILITY_PROBES,
     get_host_ip,
     get_hostname_by_unit,
     is_reachable,
+    reachable_hosts,
     unit_ip,
     units_ips,
 )
@@ -65,6 +68,26 @@ class TestHelperNetworking(unittest.TestCase):
             {"0": "1.1.1.1", "1": "2.2.2.2", "2": "3.3.3.3"},
         )
 
+    @patch("charms.opensearch.v0.helper_networking.is_reachable")
+    def test_reachable_hosts(self, is_reachable):
+        """Test the reachable hosts are returned in the order they were passed."""
+        is_reachable.side_effect = lambda host, _: host != "2.2.2.2"
+
+        self.assertEqual(
+            reachable_hosts(["3.3.3.3", "2.2.2.2", "1.1.1.1"]), ["3.3.3.3", "1.1.1.1"]
+        )
+        self.assertEqual(reachable_hosts(["2.2.2.2"]), [])
+        self.assertEqual(reachable_hosts([]), [])
+        self.assertEqual(is_reachable.call_count, 4)
+
+        # large clusters are probed through a bounded pool of threads
+        hosts = [f"10.0.0.{i}" for i in range(MAX_REACHABILITY_PROBES * 3)]
+        with patch(
+            "charms.opensearch.v0.helper_networking.ThreadPoolExecutor", wraps=ThreadPoolExecutor
+        ) as executor:
+            self.assertEqual(reachable_hosts(hosts), hosts)
+            executor.assert_called_once_with(max_workers=MAX_REACHABILITY_PROBES)
+
     def test_is_reachable(self):
         """Test if host is reachable."""
         self.assertTrue(is_reachable("google.com", 80))
@@ -3,10 +3,16 @@
 
 """Unit test for the helper_cluster library."""
 
+import os
+import pathlib
+import tempfile
+import time
 import unittest
 from datetime import datetime, timedelta
-from unittest.mock import MagicMock, patch
+from unittest.mock import MagicMock, call, patch
 
+from charms.opensearch.v0.constants_charm import SecurityIndexInitError
+from charms.opensearch.v0.constants_secrets import ADMIN_PW
 from charms.opensearch.v0.constants_tls import CertType
 from charms.opensearch.v0.models import (
     DeploymentDescription,
@@ -20,6 +26,7 @@ from charms.opensearch.v0.models import (
 )
 from charms.opensearch.v0.opensearch_base_charm import SERVICE_MANAGER, PeerRelationName
 from charms.opensearch.v0.opensearch_exceptions import (
+    OpenSearchCmdError,
     OpenSearchHttpError,
     OpenSearchInstallError,
 )
@@ -231,6 +238,68 @@ class TestOpenSearchBaseCharm(unittest.TestCase):
             self.charm.on.update_status.emit()
             self.assertTrue(isinstance(self.harness.model.unit.status, BlockedStatus))
 
+    @patch(f"{BASE_CHARM_CLASS}._recompute_roles_if_needed")
+    def test_on_recompute_roles(self, _recompute_roles_if_needed):
+        """Test the roles are only recomputed by the leader of an initialized cluster."""
+        self.charm.recompute_roles_event.emit()
+        _recompute_roles_if_needed.assert_not_called()
+
+        with self.harness.hooks_disabled():
+            self.harness.set_leader(True)
+        self.charm.recompute_roles_event.emit()
+        _recompute_roles_if_needed.assert_not_called()
+
+        self.peers_data.put(Scope.APP, "security_index_initialised", True)
+        self.charm.recompute_roles_event.emit()
+        _recompute_roles_if_needed.assert_called_once()
+
+    @patch(f"{BASE_LIB_PATH}.opensearch_base_charm.cert_expiration_remaining_hours")
+    def test_check_certs_expiration_cadence(self, cert_expiration_remaining_hours):
+        """Test the certificates expiration is checked at most every 6 hours."""
+        cert_expiration_remaining_hours.return_value = 24 * 30
+        self.charm.secrets.put_object(
+            Scope.UNIT, CertType.UNIT_TRANSPORT.val, {"cert": "transport"}
+        )
+        event = MagicMock()
+
+        for hours_since_last_check, checked in [(1, False), (7, True), (25, True)]:
+            last_check = datetime.now() - timedelta(hours=hours_since_last_check)
+            # legacy string timestamps, as well as the current POSIX timestamps
+            for stored_last_check in [
+                last_check.strftime("%Y-%m-%d %H:%M:%S"),
+                int(last_check.timestamp()),
+            ]:
+                self.peers_data.put(Scope.UNIT, "certs_exp_checked_at", stored_last_check)
+                cert_expiration_remaining_hours.reset_mock()
+
+                self.charm._check_certs_expiration(event)
+                self.assertEqual(cert_expiration_remaining_hours.called, checked)
+
+        self.assertIsInstance(self.peers_data.get(Scope.UNIT, "certs_exp_checked_at"), int)
+
+    @patch(f"{BASE_LIB_PATH}.opensearch_base_charm.reachable_hosts")
+    @patch(f"{BASE_LIB_PATH}.opensearch_base_charm.units_ips")
+    def test_alt_hosts_probed_once(self, units_ips, reachable_hosts):
+        """Test the reachability of the peer hosts is only probed once per set of hosts."""
+        units_ips.return_value = {"1": "2.2.2.2", "2": "3.3.3.3"}
+        reachable_hosts.side_effect = lambda hosts: [host for host in hosts if host != "3.3.3.3"]
+
+        self.assertEqual(self.charm.alt_hosts, ["2.2.2.2"])
+        self.assertEqual(self.charm.alt_hosts, ["2.2.2.2"])
+        reachable_hosts.assert_called_once()
+
+        units_ips.return_value = {"1": "2.2.2.2", "2": "3.3.3.3", "3": "4.4.4.4"}
+        alt_hosts = self.charm.alt_hosts
+        self.assertCountEqual(alt_hosts, ["2.2.2.2", "4.4.4.4"])
+        self.assertEqual(reachable_hosts.call_count, 2)
+
+        # shuffled once, returned as a copy
+        alt_hosts.reverse()
+        self.assertEqual(self.charm.alt_hosts, alt_hosts[::-1])
+
+        units_ips.return_value = {}
+        self.assertIsNone(self.charm.alt_hosts)
+
     def test_app_peers_data(self):
         """Test getting data from the app relation data bag."""
         self.assertIsNone(self.peers_data.get(Scope.APP, "app-key"))
@@ -257,3 +326,262 @@ class TestOpenSearchBaseCharm(unittest.TestCase):
     def test_unit_id(self):
         """Test retrieving the integer id pf a unit."""
         self.assertEqual(self.charm.unit_id, 0)
+
+    @patch(
+        f"{BASE_LIB_PATH}.opensearch_peer_clusters.OpenSearchPeerClustersManager.deployment_desc"
+    )
+    @patch(f"{BASE_LIB_PATH}.helper_cluster.ClusterTopology.recompute_nodes_conf")
+    @patch(f"{BASE_CHARM_CLASS}._reconfigure_and_restart_unit_if_needed")
+    def test_compute_and_broadcast_updated_topology(
+        self, _reconfigure_and_restart_unit_if_needed, recompute_nodes_conf, deployment_desc
+    ):
+        """Test the topology is only broadcast when it changes, regardless of the roles order."""
+        with self.harness.hooks_disabled():
+            self.harness.set_leader(True)
+        deployment_desc.return_value = self.deployment_descriptions["ok"]
+
+        current_nodes = [
+            Node(
+                name="cm1", roles=["cluster_manager", "data"], ip="1.1.1.1", app_name="opensearch"
+            )
+        ]
+        self.peers_data.put_object(
+            Scope.APP, "nodes_config", {node.name: node.to_dict() for node in current_nodes}
+        )
+
+        # same roles, in another order
+        recompute_nodes_conf.return_value = {
+            "cm1": Node(
+                name="cm1", roles=["data", "cluster_manager"], ip="1.1.1.1", app_name="opensearch"
+            )
+        }
+        self.charm._compute_and_broadcast_updated_topology(current_nodes)
+        _reconfigure_and_restart_unit_if_needed.assert_not_called()
+        self.assertEqual(
+            self.peers_data.get_object(Scope.APP, "nodes_config")["cm1"]["roles"],
+            ["cluster_manager", "data"],
+        )
+
+        recompute_nodes_conf.return_value = {
+            "cm1": Node(name="cm1", roles=["ml", "data"], ip="1.1.1.1", app_name="opensearch")
+        }
+        self.charm._compute_and_broadcast_updated_topology(current_nodes)
+        _reconfigure_and_restart_unit_if_needed.assert_called_once_with(
+            recompute_nodes_conf.return_value
+        )
+        self.assertEqual(
+            self.peers_data.get_object(Scope.APP, "nodes_config")["cm1"]["roles"], ["data", "ml"]
+        )
+
+    @patch(f"{BASE_LIB_PATH}.opensearch_distro.reachable_hosts")
+    @patch(f"{BASE_LIB_PATH}.opensearch_distro.requests.Session")
+    def test_request_reuses_http_session(self, session, reachable_hosts):
+        """Test the requests of a hook share one HTTP session, closed when the node stops."""
+        opensearch = self.charm.opensearch
+        reachable_hosts.side_effect = lambda hosts: hosts
+        session.return_value.request.return_value.json.return_value = {"status": "OK"}
+        with self.harness.hooks_disabled():
+            self.harness.set_leader(True)
+        self.charm.secrets.put(Scope.APP, ADMIN_PW, "pwd1")
+
+        with patch(f"{self.OPENSEARCH_DISTRO}.is_started", return_value=False), patch(
+            f"{self.OPENSEARCH_DISTRO}._stop_service"
+        ):
+            opensearch.request("GET", "/")
+            self.charm.secrets.put(Scope.APP, ADMIN_PW, "pwd2")
+            opensearch.request("GET", "/")
+            session.assert_called_once()
+            self.assertEqual(
+                [c.kwargs["auth"] for c in session.return_value.request.call_args_list],
+                [("admin", "pwd1"), ("admin", "pwd2")],
+            )
+
+            opensearch.stop()
+            session.return_value.close.assert_called_once()
+
+            opensearch.request("GET", "/")
+            self.assertEqual(session.call_count, 2)
+
+    @patch("charm.OpenSearchOperatorCharm._are_all_tls_resources_stored")
+    def test_scrape_config(self, _are_all_tls_resources_stored):
+        """Test the scrape config fetches the admin secrets once and picks the scheme."""
+        _are_all_tls_resources_stored.return_value = True
+        with self.harness.hooks_disabled():
+            self.harness.set_leader(True)
+
+        # no certificates yet
+        [scrape_config] = self.charm._scrape_config()
+        self.assertEqual(scrape_config["scheme"], "http")
+        self.assertIsNone(scrape_config["tls_config"]["ca"])
+
+        self.peers_data.put(Scope.APP, "admin_user_initialized", True)
+        self.charm.secrets.put_object(
+            Scope.APP, CertType.APP_ADMIN.val, {"cert": "c", "chain": "ch", "ca-cert": "ca"}
+        )
+        for cert_type in [CertType.UNIT_TRANSPORT, CertType.UNIT_HTTP]:
+            self.charm.secrets.put_object(Scope.UNIT, cert_type.val, {"cert": "c"})
+
+        with patch.object(
+            self.charm.secrets, "get_object", wraps=self.charm.secrets.get_object
+        ) as get_object:
+            [scrape_config] = self.charm._scrape_config()
+            self.assertEqual(
+                [c.args[1] for c in get_object.call_args_list].count(CertType.APP_ADMIN.val), 1
+            )
+
+        self.assertEqual(scrape_config["scheme"], "https")
+        self.assertEqual(scrape_config["tls_config"]["ca"], "ca")
+
+    def test_initialize_security_index(self):
+        """Test the security admin script runs in the background, across calls."""
+        with self.harness.hooks_disabled():
+            self.harness.set_leader(True)
+
+        paths = self.opensearch.paths
+        with tempfile.TemporaryDirectory() as tmp_dir, patch.multiple(
+            paths, home=tmp_dir, tmp=tmp_dir, logs=tmp_dir
+        ):
+            script = pathlib.Path(f"{tmp_dir}/plugins/opensearch-security/tools/securityadmin.sh")
+            script.parent.mkdir(parents=True)
+            script.write_text(f"#!/bin/sh\nwhile [ ! -f {tmp_dir}/go ]; do sleep 0.1; done\n")
+            script.chmod(0o755)
+
+            # script started
+            self.assertFalse(self.charm._initialize_security_index({}))
+            pid = self.peers_data.get(Scope.UNIT, "securityadmin_pid")
+            self.assertIsNotNone(pid)
+
+            # the command line of the process is only readable once it is fully set up
+            cmdline = pathlib.Path(f"/proc/{pid}/cmdline")
+            for _ in range(50):
+                if cmdline.read_bytes():
+                    break
+                time.sleep(0.02)
+
+            # script still running
+            self.assertFalse(self.charm._initialize_security_index({}))
+            self.assertEqual(self.peers_data.get(Scope.UNIT, "securityadmin_pid"), pid)
+
+            # script still running past its deadline
+            self.peers_data.put(Scope.UNIT, "securityadmin_started_at", 0)
+            with self.assertRaises(OpenSearchCmdError):
+                self.charm._initialize_security_index({})
+            self.assertIsInstance(self.charm.unit.status, BlockedStatus)
+            self.assertIsNone(self.peers_data.get(Scope.UNIT, "securityadmin_pid"))
+
+            # a failed run is never started again
+            with patch.object(self.opensearch, "start_script") as start_script:
+                with self.assertRaises(OpenSearchCmdError):
+                    self.charm._initialize_security_index({})
+                start_script.assert_not_called()
+
+            pathlib.Path(f"{tmp_dir}/go").touch()
+            os.waitpid(pid, 0)
+            self.peers_data.delete(Scope.APP, "security_index_init_failed")
+
+            # script completed
+            self.assertFalse(self.charm._initialize_security_index({}))
+            os.waitpid(self.peers_data.get(Scope.UNIT, "securityadmin_pid"), 0)
+            self.assertTrue(self.charm._initialize_security_index({}))
+            self.assertIsNone(self.peers_data.get(Scope.UNIT, "securityadmin_pid"))
+
+            # script failed
+            script.write_text("#!/bin/sh\nexit 3\n")
+            self.assertFalse(self.charm._initialize_security_index({}))
+            os.waitpid(self.peers_data.get(Scope.UNIT, "securityadmin_pid"), 0)
+            with self.assertRaises(OpenSearchCmdError):
+                self.charm._initialize_security_index({})
+            self.assertIsNone(self.peers_data.get(Scope.UNIT, "securityadmin_pid"))
+            self.assertTrue(self.peers_data.get(Scope.APP, "security_index_init_failed"))
+            self.peers_data.delete(Scope.APP, "security_index_init_failed")
+
+            # pid reused by an unrelated process, i.e. after a reboot: not reported as running
+            pathlib.Path(f"{tmp_dir}/securityadmin.sh.exit_code").unlink()
+            self.peers_data.put(Scope.UNIT, "securityadmin_pid", os.getpid())
+            self.peers_data.put(Scope.UNIT, "securityadmin_started_at", int(time.time()))
+            with self.assertRaises(OpenSearchCmdError):
+                self.charm._initialize_security_index({})
+            self.assertTrue(self.peers_data.get(Scope.APP, "security_index_init_failed"))
+
+    @patch(f"{BASE_CHARM_CLASS}._initialize_security_index")
+    def test_post_start_init_security_index_failed(self, _initialize_security_index):
+        """Test the starting flag is released when the security index init failed."""
+        with self.harness.hooks_disabled():
+            self.harness.set_leader(True)
+            self.peers_data.put(Scope.UNIT, "starting", True)
+
+        _initialize_security_index.side_effect = OpenSearchCmdError("failed")
+        self.charm._post_start_init()
+        self.assertIsNone(self.peers_data.get(Scope.UNIT, "starting"))
+
+    @patch(f"{BASE_CHARM_CLASS}._request_service_op")
+    def test_on_retry_security_index_init_action(self, _request_service_op):
+        """Test the action allows the security index init to run again after a failure."""
+        event = MagicMock()
+        self.charm._on_retry_security_index_init_action(event)
+        event.fail.assert_called_once()
+        _request_service_op.assert_not_called()
+
+        with self.harness.hooks_disabled():
+            self.harness.set_leader(True)
+
+        # nothing to retry
+        event = MagicMock()
+        self.charm._on_retry_security_index_init_action(event)
+        event.fail.assert_called_once()
+        _request_service_op.assert_not_called()
+
+        self.peers_data.put(Scope.APP, "security_index_init_failed", True)
+        self.charm.unit.status = BlockedStatus(SecurityIndexInitError)
+        event = MagicMock()
+        self.charm._on_retry_security_index_init_action(event)
+        event.fail.assert_not_called()
+        self.assertIsNone(self.peers_data.get(Scope.APP, "security_index_init_failed"))
+        self.assertNotIsInstance(self.charm.unit.status, BlockedStatus)
+        _request_service_op.assert_called_once_with(self.charm.START_CALLBACK)
+
+    @patch("ops.framework.BoundEvent.emit")
+    def test_request_service_op(self, emit):
+        """Test every service op request asks for the lock, even twice in the same hook."""
+        self.charm._request_service_op(self.charm.RESTART_CALLBACK)
+        self.charm._request_service_op(self.charm.RESTART_CALLBACK)
+        self.assertEqual(
+            emit.call_args_list, [call(callback_override=self.charm.RESTART_CALLBACK)] * 2
+        )
+
+    @patch(f"{BASE_CHARM_CLASS}._request_service_op")
+    def test_reconfigure_and_restart_unit_if_needed(self, _request_service_op):
+        """Test the unit restarts when the nodes config broadcast changes its roles."""
+        with self.harness.hooks_disabled():
+            self.harness.set_leader(True)
+
+        nodes_config = {
+            self.charm.unit_name: Node(
+                name=self.charm.unit_name, roles=["data"], ip="1.1.1.1", app_name="opensearch"
+            ),
+            "cm1": Node(
+                name="cm1", roles=["cluster_manager"], ip="2.2.2.2", app_name="opensearch"
+            ),
+        }
+        self.peers_data.put_object(
+            Scope.APP,
+            "nodes_config",
+            {name: node.to_dict() for name, node in nodes_config.items()},
+        )
+
+        with patch.object(
+            self.charm.opensearch_config, "add_seed_hosts"
+        ) as add_seed_hosts, patch.object(self.charm.opensearch_config, "load_node") as load_node:
+            # read from the data bag, or passed by the leader
+            for passed_nodes_config in [None, nodes_config]:
+                add_seed_hosts.reset_mock()
+                _request_service_op.reset_mock()
+
+                load_node.return_value = {"node.roles": ["data"]}
+                self.charm._reconfigure_and_restart_unit_if_needed(passed_nodes_config)
+                add_seed_hosts.assert_called_once_with(["2.2.2.2"])
+                _request_service_op.assert_not_called()
+
+                load_node.return_value = {"node.roles": ["data", "ingest"]}
+                self.charm._reconfigure_and_restart_unit_if_needed(passed_nodes_config)
+                _request_service_op.assert_called_once_with(self.charm.RESTART_CALLBACK)
@@ -4,6 +4,7 @@
 """Unit test for the helper_cluster library."""
 
 import unittest
+from unittest.mock import patch
 
 from charms.opensearch.v0.constants_charm import PeerRelationName
 from charms.opensearch.v0.models import (
@@ -15,6 +16,7 @@ from charms.opensearch.v0.models import (
     State,
 )
 from charms.opensearch.v0.opensearch_internal_data import Scope
+from ops.model import RelationDataContent
 from ops.testing import Harness
 from parameterized import parameterized
 
@@ -65,6 +67,36 @@ class TestOpenSearchInternalData(unittest.TestCase):
         self.assertEqual(self.store.get(scope, "str"), "str-val")
         self.assertEqual(self.store.get(scope, "str", auto_casting=False), "str-val")
 
+    @parameterized.expand([Scope.APP, Scope.UNIT])
+    def test_repeated_get_is_cast_once(self, scope):
+        """Test repeated reads of the same value only parse it once."""
+        self.store.put(scope, "int-cast", 42)
+        self.assertEqual(self.store.get(scope, "int-cast"), 42)
+
+        hits = self.store.cast.cache_info().hits
+        self.assertEqual(self.store.get(scope, "int-cast"), 42)
+        self.assertEqual(self.store.cast.cache_info().hits, hits + 1)
+
+        self.store.put(scope, "int-cast", 43)
+        self.assertEqual(self.store.get(scope, "int-cast"), 43)
+
+    @parameterized.expand([Scope.APP, Scope.UNIT])
+    def test_put_unchanged_value_skips_write(self, scope):
+        """Test that re-writing the current value of a key leaves the relation data as is."""
+        self.store.put(scope, "written-once", 1)
+
+        set_item = RelationDataContent.__setitem__
+        with patch.object(
+            RelationDataContent, "__setitem__", autospec=True, side_effect=set_item
+        ) as databag_write:
+            self.store.put(scope, "written-once", 1)
+            databag_write.assert_not_called()
+
+            self.store.put(scope, "written-once", 2)
+            databag_write.assert_called_once()
+
+        self.assertEqual(self.store.get(scope, "written-once"), 2)
+
     @parameterized.expand([Scope.APP, Scope.UNIT])
     def test_data_has(self, scope):
         """Test checking on the existence of a key."""
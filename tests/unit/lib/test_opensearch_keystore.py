@@ -48,6 +48,21 @@ class TestOpenSearchKeystore(unittest.TestCase):
         self.charm.opensearch.run_bin = MagicMock(return_value=RETURN_LIST_KEYSTORE)
         assert ["key1", "key2", "keystore.seed"] == self.keystore.list()
 
+    def test_keystore_list_cached(self):
+        """Tests the keys are only listed again once the keystore changed."""
+        self.charm.opensearch.run_bin = MagicMock(return_value=RETURN_LIST_KEYSTORE)
+        self.keystore.list()
+        self.keystore.list()
+        self.charm.opensearch.run_bin.assert_called_once()
+
+        self.keystore.add({"key3": "secret3"})
+        self.keystore.list()
+        self.assertEqual(self.charm.opensearch.run_bin.call_count, 3)
+
+        self.keystore.delete(["key3"])
+        self.keystore.list()
+        self.assertEqual(self.charm.opensearch.run_bin.call_count, 5)
+
     def test_keystore_add_keypair(self) -> None:
         """Add data to keystore."""
         self.charm.opensearch.request = MagicMock(return_value={"status": 200})
@@ -57,6 +72,38 @@ class TestOpenSearchKeystore(unittest.TestCase):
             [call("opensearch-keystore", "add --force key1", stdin="secret1\n")]
         )
 
+    def test_keystore_add_many_keypairs(self) -> None:
+        """Add multiple entries to keystore in a single call."""
+        self.charm.opensearch.run_bin = MagicMock(return_value="")
+        self.keystore.add({"key1": "secret1", "key2": "secret2"})
+        self.charm.opensearch.run_bin.assert_called_once_with(
+            "opensearch-keystore", "add --force --stdin key1 key2", stdin="secret1\nsecret2\n"
+        )
+
+    def test_keystore_delete_many_keypairs(self) -> None:
+        """Delete multiple entries of the keystore, one by one if any is missing."""
+        self.charm.opensearch.run_bin = MagicMock(return_value="")
+        self.keystore.delete(["key1", "key2"])
+        self.charm.opensearch.run_bin.assert_called_once_with(
+            "opensearch-keystore", "remove key1 key2"
+        )
+
+        self.charm.opensearch.run_bin = MagicMock(
+            side_effect=[
+                OpenSearchCmdError("ERROR: Setting [key1] does not exist in the keystore."),
+                OpenSearchCmdError("ERROR: Setting [key1] does not exist in the keystore."),
+                "",
+            ]
+        )
+        self.keystore.delete(["key1", "key2"])
+        self.charm.opensearch.run_bin.assert_has_calls(
+            [
+                call("opensearch-keystore", "remove key1 key2"),
+                call("opensearch-keystore", "remove key1"),
+                call("opensearch-keystore", "remove key2"),
+            ]
+        )
+
     def test_keystore_delete_keypair(self) -> None:
         """Delete data to keystore."""
         self.charm.opensearch.request = MagicMock(return_value={"status": 200})
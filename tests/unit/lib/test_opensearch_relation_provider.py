@@ -2,7 +2,7 @@
 # See LICENSE file for licensing details.
 
 import unittest
-from unittest.mock import MagicMock, PropertyMock, patch
+from unittest.mock import MagicMock, PropertyMock, call, patch
 
 from charms.opensearch.v0.constants_charm import ClientRelationName, PeerRelationName
 from charms.opensearch.v0.opensearch_base_charm import SERVICE_MANAGER
@@ -188,3 +188,23 @@ class TestOpenSearchProvider(unittest.TestCase):
         endpoints = [f"{node.ip}:{self.charm.opensearch.port}" for node in _nodes.return_value]
         self.opensearch_provider.update_endpoints(relation)
         _set_endpoints.assert_called_with(relation.id, ",".join(endpoints))
+
+    @patch("charms.data_platform_libs.v0.data_interfaces.OpenSearchProvides.set_endpoints")
+    @patch(
+        "charms.opensearch.v0.opensearch_distro.OpenSearchDistribution.is_node_up",
+        return_value=True,
+    )
+    @patch("charm.OpenSearchOperatorCharm._get_nodes")
+    @patch("charm.OpenSearchOperatorCharm._put_admin_user")
+    @patch("charm.OpenSearchOperatorCharm._purge_users")
+    def test_update_all_endpoints(self, _, __, _nodes, _is_node_up, _set_endpoints):
+        self.harness.set_leader(True)
+        node = MagicMock()
+        node.ip = "4.4.4.4"
+        _nodes.return_value = [node]
+        relations = [MagicMock(id=1), MagicMock(id=2)]
+        endpoints = f"{node.ip}:{self.charm.opensearch.port}"
+
+        self.opensearch_provider.update_all_endpoints(relations)
+        _nodes.assert_called_once()
+        _set_endpoints.assert_has_calls([call(1, endpoints), call(2, endpoints)])
@@ -105,6 +105,14 @@ class TestOpenSearchSecrets(TestOpenSearchInternalData):
         self.store.put_object(scope, "key-obj", {"name1": None, "name2": "val2"}, merge=True)
         self.assertDictEqual(self.store.get_object(scope, "key-obj"), {"name2": "val2"})
 
+    @override
+    @parameterized.expand([Scope.APP, Scope.UNIT])
+    def test_put_unchanged_value_skips_write(self, scope):
+        """Test re-writing the current value of a key in the secret store."""
+        self.store.put(scope, "written-once", 1)
+        self.store.put(scope, "written-once", 1)
+        self.assertEqual(self.store.get(scope, "written-once"), 1)
+
     @override
     @parameterized.expand([Scope.APP, Scope.UNIT])
     def test_nullify_obj(self, scope):
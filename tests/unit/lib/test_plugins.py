@@ -6,6 +6,7 @@ import unittest
 from unittest.mock import MagicMock, PropertyMock, call, patch
 
 import charms
+from charms.opensearch.v0.constants_charm import PeerRelationName
 from charms.opensearch.v0.opensearch_backups import OpenSearchBackupPlugin
 from charms.opensearch.v0.opensearch_exceptions import OpenSearchCmdError
 from charms.opensearch.v0.opensearch_health import HealthColors
@@ -177,6 +178,74 @@ class TestOpenSearchPlugin(unittest.TestCase):
         # Check if we had any exception
         assert succeeded is True
 
+    def test_plugins_cached(self) -> None:
+        """Tests plugins are built once per event scope, and get_plugin only builds its own."""
+        charms.opensearch.v0.opensearch_plugin_manager.ConfigExposedPlugins[
+            "test-already-installed"
+        ] = {"class": TestPluginAlreadyInstalled, "config": None, "relation": None}
+
+        with patch.object(
+            self.plugin_manager, "_extra_conf", wraps=self.plugin_manager._extra_conf
+        ) as _extra_conf:
+            plugin = self.plugin_manager.get_plugin(TestPluginAlreadyInstalled)
+            self.assertIsInstance(plugin, TestPluginAlreadyInstalled)
+            self.assertIs(self.plugin_manager.get_plugin(TestPluginAlreadyInstalled), plugin)
+            _extra_conf.assert_called_once()
+
+            self.assertIs(self.plugin_manager.plugins, self.plugin_manager.plugins)
+            self.assertEqual(_extra_conf.call_count, 3)
+
+            self.plugin_manager.reset_event_scope()
+            self.assertIsNot(self.plugin_manager.get_plugin(TestPluginAlreadyInstalled), plugin)
+
+        with self.assertRaises(KeyError):
+            self.plugin_manager.get_plugin(OpenSearchBackupPlugin)
+
+    def test_iter_plugins(self) -> None:
+        """Tests the plugins are only built as they are iterated over."""
+        charms.opensearch.v0.opensearch_plugin_manager.ConfigExposedPlugins[
+            "test-already-installed"
+        ] = {"class": TestPluginAlreadyInstalled, "config": None, "relation": None}
+
+        with patch.object(
+            self.plugin_manager, "_extra_conf", wraps=self.plugin_manager._extra_conf
+        ) as _extra_conf:
+            plugins = self.plugin_manager.iter_plugins()
+            _extra_conf.assert_not_called()
+            self.assertIsInstance(next(plugins), TestPlugin)
+            _extra_conf.assert_called_once()
+
+    def test_lifecycle_steps_reuse_user_request(self) -> None:
+        """Tests the lifecycle steps do not compute a user request passed to them again."""
+        test_plugin = self.plugin_manager.plugins[0]
+        with patch.object(
+            self.plugin_manager, "status", return_value=PluginState.MISSING
+        ), patch.object(self.plugin_manager, "_user_requested_to_enable") as user_requested:
+            self.assertFalse(
+                self.plugin_manager._install_if_needed(test_plugin, user_requested=False)
+            )
+            self.assertFalse(
+                self.plugin_manager._disable_if_needed(test_plugin, user_requested=True)
+            )
+            user_requested.assert_not_called()
+
+    def test_installed_plugins_cached(self) -> None:
+        """Tests plugins are only listed again once a plugin is installed or removed."""
+        self.charm.opensearch._run_cmd = MagicMock(return_value=RETURN_LIST_PLUGINS)
+        test_plugin = self.plugin_manager.plugins[0]
+
+        self.assertIn("opensearch-knn", self.plugin_manager._installed_plugins())
+        self.assertEqual(len(self.plugin_manager._installed_plugins()), 17)
+        self.charm.opensearch._run_cmd.assert_called_once()
+
+        self.plugin_manager._remove_plugin(test_plugin)
+        self.plugin_manager._installed_plugins()
+        self.assertEqual(self.charm.opensearch._run_cmd.call_count, 3)
+
+        self.plugin_manager.reset_event_scope()
+        self.plugin_manager._installed_plugins()
+        self.assertEqual(self.charm.opensearch._run_cmd.call_count, 4)
+
     @patch(
         "charms.opensearch.v0.opensearch_distro.OpenSearchDistribution.version",
         new_callable=PropertyMock,
@@ -211,6 +280,38 @@ class TestOpenSearchPlugin(unittest.TestCase):
         self.harness.update_config({})
         self.plugin_manager.run.assert_called()
 
+    @patch(
+        f"{BASE_LIB_PATH}.opensearch_peer_clusters.OpenSearchPeerClustersManager.deployment_desc"
+    )
+    @patch(
+        "charms.opensearch.v0.opensearch_distro.OpenSearchDistribution.version",
+        new_callable=PropertyMock,
+    )
+    def test_plugins_skipped_on_unchanged_config(self, mock_version, deployment_desc) -> None:
+        """Config changes without any plugin related input change should not run plugins."""
+        deployment_desc.return_value = "something"
+        mock_version.return_value = "2.9.0"
+        self.plugin_manager.run = MagicMock(return_value=False)
+        self.plugin_manager._installed_plugins = MagicMock(return_value=["test"])
+        self.charm.opensearch_config.update_host_if_needed = MagicMock(return_value=False)
+        self.harness.add_relation(PeerRelationName, self.charm.app.name)
+
+        self.harness.update_config({})
+        self.harness.update_config({})
+        self.plugin_manager.run.assert_called_once()
+
+        # a new plugin input must trigger a new run
+        self.plugin_manager._installed_plugins.return_value = ["test", "other"]
+        self.harness.update_config({})
+        self.assertEqual(self.plugin_manager.run.call_count, 2)
+
+        # as well as a host change
+        self.charm.opensearch_config.update_host_if_needed.return_value = True
+        self.charm.tls.request_new_unit_certificates = MagicMock()
+        self.charm._delete_stored_tls_resources = MagicMock()
+        self.harness.update_config({})
+        self.assertEqual(self.plugin_manager.run.call_count, 3)
+
     @patch("charms.opensearch.v0.opensearch_plugin_manager.OpenSearchPluginManager.status")
     @patch(
         "charms.opensearch.v0.opensearch_plugin_manager.OpenSearchPluginManager._installed_plugins"
@@ -374,6 +475,54 @@ class TestOpenSearchPlugin(unittest.TestCase):
         self.plugin_manager._keystore._delete.assert_called()
         self.plugin_manager._opensearch_config.delete_plugin.assert_has_calls([call(["param"])])
 
+    @patch("charms.opensearch.v0.opensearch_plugin_manager.OpenSearchPluginManager._is_enabled")
+    @patch(
+        "charms.opensearch.v0.opensearch_plugin_manager.OpenSearchPluginManager._installed_plugins"
+    )
+    def test_run_enabled_plugin_status_computed_once(
+        self, mock_installed_plugins, mock_is_enabled
+    ) -> None:
+        """Tests the status of a plugin with nothing to do is only computed once per run."""
+        mock_installed_plugins.return_value = ["test"]
+        mock_is_enabled.return_value = True
+
+        with patch.object(
+            self.plugin_manager, "status", wraps=self.plugin_manager.status
+        ) as mock_status:
+            self.assertFalse(self.plugin_manager.run())
+            mock_status.assert_called_once()
+
+    def test_apply_config_without_secrets(self) -> None:
+        """Tests the keystore is left untouched when a config has no secret entries."""
+        self.plugin_manager._keystore = MagicMock()
+        self.plugin_manager._opensearch_config.delete_plugin = MagicMock()
+        self.plugin_manager._opensearch_config.add_plugin = MagicMock()
+
+        self.assertTrue(
+            self.plugin_manager.apply_config(
+                OpenSearchPluginConfig(
+                    config_entries_to_add={"param": "tested"},
+                    config_entries_to_del=["param"],
+                )
+            )
+        )
+        self.plugin_manager._keystore.delete.assert_not_called()
+        self.plugin_manager._keystore.add.assert_not_called()
+        self.plugin_manager._keystore.reload_keystore.assert_not_called()
+
+        # a key overwritten by the same config is only added, not removed beforehand
+        self.assertFalse(
+            self.plugin_manager.apply_config(
+                OpenSearchPluginConfig(
+                    secret_entries_to_add={"key": "secret"},
+                    secret_entries_to_del=["key"],
+                )
+            )
+        )
+        self.plugin_manager._keystore.delete.assert_not_called()
+        self.plugin_manager._keystore.add.assert_called_once_with({"key": "secret"})
+        self.plugin_manager._keystore.reload_keystore.assert_called_once()
+
 
 class TestOpenSearchBackupPlugin(unittest.TestCase):
     def setUp(self) -> None: